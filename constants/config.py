@@ -34,6 +34,11 @@ IMAGE_URL_COLUMN = "image_url"
 # Column name for a descriptive title/name field (e.g., "title", "name", "username")
 TITLE_COLUMN = "title"
 
+# Column name for the thumbnail URL field (optional, e.g., "thumbnail_url")
+# When set, uploads also store a small preview image and the editor shows it
+# instead of downloading the full-size image. Set to None to disable.
+THUMBNAIL_URL_COLUMN = None
+
 # Additional columns to display in the table (optional)
 # These will be shown in the info panel when a row is selected
 # Example: ["description", "price", "category"] or ["email", "full_name"]
@@ -44,28 +49,62 @@ ADDITIONAL_DISPLAY_COLUMNS = ["listing_url"]
 ENTITY_LABEL = "Property"
 ENTITY_LABEL_PLURAL = "Properties"
 
+# Data Loading Configuration
+DATA_FETCH_PAGE_SIZE = 1000  # Rows per Supabase request when backfilling records
+REFRESH_MIN_INTERVAL = 2.0  # seconds between database reloads from the refresh button
+
 # Image Validation Configuration
-IMAGE_CHECK_TIMEOUT = 3  # seconds (for HEAD requests to validate URLs)
-IMAGE_CHECK_MAX_WORKERS = 10
+IMAGE_CHECK_TIMEOUT = 3  # seconds (for requests validating image URLs)
+IMAGE_CHECK_CONCURRENCY = 64  # Max in-flight URL checks
+IMAGE_STATUS_CACHE_TTL = 300  # seconds (reuse cached statuses without any request)
+IMAGE_STATUS_CACHE_SIZE = 8192  # URLs whose status is kept in memory
+IMAGE_STATUS_BATCH_INTERVAL = 0.1  # seconds between streamed status table updates
+
+# HTTP Connection Pool Configuration
+HTTP_POOL_CONNECTIONS = 16  # Number of per-host connection pools to keep
+HTTP_POOL_MAXSIZE = 32  # Max keep-alive connections per host
+SUPABASE_POOL_MAX_CONNECTIONS = 20  # Max open connections to Supabase
+SUPABASE_POOL_KEEPALIVE = 10  # Idle connections kept open to Supabase
+SUPABASE_POOL_KEEPALIVE_EXPIRY = 30  # seconds before an idle connection closes
+SUPABASE_REQUEST_TIMEOUT = 60  # seconds per database or storage request
 
 # Image Download Configuration
 IMAGE_DOWNLOAD_TIMEOUT = 10  # seconds (for downloading full images from URLs)
+IMAGE_DOWNLOAD_MAX_BYTES = 25 * 1024 * 1024  # Abort downloads larger than 25 MB
+IMAGE_DOWNLOAD_CHUNK_SIZE = 64 * 1024  # Bytes read per streamed chunk
+IMAGE_DOWNLOAD_RETRIES = 3  # Retries for transient errors in batch scripts
+IMAGE_DOWNLOAD_RETRY_BACKOFF = 0.3  # Backoff factor between retries (seconds)
 
 # Image Optimization Configuration
 IMAGE_MAX_DIMENSION = 1920  # Max width/height for full images (1920px for HD)
 IMAGE_QUALITY = 85  # JPEG quality (1-95, 85 is good balance)
+IMAGE_RESAMPLE_FILTER = "BICUBIC"  # Pillow resize filter (uploads and batch script)
+IMAGE_PROGRESSIVE = True  # Save progressive JPEGs
+IMAGE_SUBSAMPLING = 2  # Chroma subsampling: 0 = 4:4:4, 1 = 4:2:2, 2 = 4:2:0
 THUMBNAIL_MAX_DIMENSION = 400  # Max dimension for thumbnails
 THUMBNAIL_QUALITY = 75  # Lower quality for thumbnails (smaller file size)
+PREVIEW_FORMAT = "WEBP"  # Thumbnail format: "WEBP" (smaller) or "JPEG"
+THUMBNAIL_FOLDER = "thumbnails"  # Storage folder for thumbnails
 ENABLE_IMAGE_OPTIMIZATION = True  # Enable/disable image optimization
+IMAGE_OPTIMIZATION_WORKERS = 2  # Threads optimizing uploads (all sessions)
+IMAGE_OPTIMIZATION_PROCESSES = False  # Use worker processes instead of threads
+BATCH_OPTIMIZATION_WORKERS = 16  # Download/upload threads in the batch script
+BATCH_OPTIMIZATION_CPU_WORKERS = min(os.cpu_count() or 1, 8)  # Optimizer threads
+BATCH_PIPELINE_QUEUE_SIZE = 32  # Images buffered between batch script stages
+ALREADY_OPTIMIZED_KB = 150  # Smaller JPEGs skip optimization (0 disables)
+OPTIMIZED_CACHE_SIZE = 16  # Recent optimized uploads reused for identical files
 
 # UI Configuration
 TABLE_PAGE_SIZE = 20
 IMAGE_PREVIEW_WIDTH = 300
 IMAGE_PREVIEW_HEIGHT = 200
 ACCEPTED_IMAGE_FORMATS = ".jpg,.jpeg,.png,.webp"
+UI_UPDATE_TIMEOUT = 30  # seconds a background load waits for a UI update
 
 # URL Signing Configuration
 SIGNED_URL_EXPIRY_YEARS = 10
+SIGNED_URL_CACHE_SIZE = 4096  # signed URLs kept in memory per process
+SIGNED_URL_REFRESH_RATIO = 0.9  # re-sign after this fraction of the expiry
 
 # Status Filter Options
 STATUS_FILTER_OPTIONS = ["All", "OK", "Error"]
@@ -74,6 +113,7 @@ STATUS_FILTER_DEFAULT = "All"
 # Upload Type Options
 UPLOAD_TYPE_OPTIONS = ["Upload File", "Image URL"]
 UPLOAD_TYPE_DEFAULT = "Upload File"
+UPLOAD_CONCURRENCY = 4  # Max uploads writing to Supabase at once (all sessions)
 
 # Theme Configuration
 HEADER_BACKGROUND_COLOR = "#3A7D7E"
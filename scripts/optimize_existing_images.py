@@ -4,34 +4,58 @@ This script downloads all existing images, optimizes them, and re-uploads them.
 
 Usage:
     python scripts/optimize_existing_images.py [--dry-run] [--limit N]
+        [--workers N] [--cpu-workers N]
 
 Options:
     --dry-run: Preview what would be optimized without making changes
     --limit N: Only process first N images (for testing)
+    --workers N: Threads downloading and uploading images
+    --cpu-workers N: Threads optimizing images
+
+JPEG encoding uses libjpeg-turbo through PyTurboJPEG when it is installed
+(pip install PyTurboJPEG), and falls back to Pillow otherwise.
 """
 
 import argparse
+import math
+import queue
 import sys
+import threading
+from functools import partial
 from io import BytesIO
 from pathlib import Path
+from typing import Any, Callable, Iterable, Iterator, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import requests
 from dotenv import load_dotenv
 from PIL import Image, ImageOps
+from postgrest.types import ReturnMethod
 from supabase import Client, create_client
+from urllib3.util.retry import Retry
 
 # Add parent directory to path to import from constants
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from constants.config import (
+    ALREADY_OPTIMIZED_KB,
+    BATCH_OPTIMIZATION_CPU_WORKERS,
+    BATCH_OPTIMIZATION_WORKERS,
+    BATCH_PIPELINE_QUEUE_SIZE,
+    DATA_FETCH_PAGE_SIZE,
     DATA_TABLE,
     ENTITY_LABEL,
     ENTITY_LABEL_PLURAL,
     ID_COLUMN,
+    IMAGE_DOWNLOAD_RETRIES,
+    IMAGE_DOWNLOAD_RETRY_BACKOFF,
     IMAGE_DOWNLOAD_TIMEOUT,
     IMAGE_MAX_DIMENSION,
+    IMAGE_PROGRESSIVE,
     IMAGE_QUALITY,
+    IMAGE_RESAMPLE_FILTER,
+    IMAGE_SUBSAMPLING,
     IMAGE_URL_COLUMN,
     SIGNED_URL_EXPIRY_YEARS,
     STORAGE_BUCKET,
@@ -40,10 +64,26 @@ from constants.config import (
     TITLE_COLUMN,
 )
 from utils.file_helpers import create_record_filename
+from utils.http_session import create_session
 
 # Load environment variables
 load_dotenv()
 
+# End-of-input marker passed between pipeline stages
+_PIPELINE_DONE = object()
+
+# Resize filter for the final downscale; draft() already did the bulk of it
+RESAMPLE_FILTER = Image.Resampling[IMAGE_RESAMPLE_FILTER.upper()]
+
+# Optional SIMD JPEG encoder; creating TurboJPEG loads the native library once.
+# Without the native library (even with the wheel installed) Pillow is used.
+try:
+    from turbojpeg import TJFLAG_PROGRESSIVE, TJPF_RGB, TurboJPEG
+
+    turbo_jpeg = TurboJPEG()
+except (ImportError, OSError, RuntimeError):
+    turbo_jpeg = None
+
 
 class SimpleImageOptimizer:
     """Standalone image optimizer using configuration from constants."""
@@ -55,31 +95,85 @@ class SimpleImageOptimizer:
         quality: int = IMAGE_QUALITY,
     ):
         """Optimize an image."""
+        img, _ = SimpleImageOptimizer.open_and_info(image_data, max_dimension)
+        return (
+            SimpleImageOptimizer.optimize_opened_image(img, max_dimension, quality),
+            "jpeg",
+        )
+
+    @staticmethod
+    def open_and_info(
+        image_data: bytes, max_dimension: int = IMAGE_MAX_DIMENSION
+    ) -> Tuple[Image.Image, dict]:
+        """Open an image once and return it together with its information."""
         img = Image.open(BytesIO(image_data))
+        info = {
+            "width": img.width,
+            "height": img.height,
+            "format": img.format,
+            "mode": img.mode,
+            "size_bytes": len(image_data),
+        }
 
-        # Convert RGBA to RGB
-        if img.mode in ("RGBA", "LA", "P"):
-            background = Image.new("RGB", img.size, (255, 255, 255))
-            if img.mode == "P":
-                img = img.convert("RGBA")
-            background.paste(
-                img, mask=img.split()[-1] if img.mode in ("RGBA", "LA") else None
+        # Let libjpeg decode large JPEGs at a reduced scale (no-op for other
+        # formats); draft() keeps both sides at least the requested size
+        if max(img.size) > max_dimension:
+            ratio = max_dimension / max(img.size)
+            img.draft(
+                "RGB", (math.ceil(img.width * ratio), math.ceil(img.height * ratio))
             )
-            img = background
+
+        return img, info
+
+    @staticmethod
+    def optimize_opened_image(
+        img: Image.Image,
+        max_dimension: int = IMAGE_MAX_DIMENSION,
+        quality: int = IMAGE_QUALITY,
+    ) -> bytes:
+        """Optimize an image returned by open_and_info()."""
+        # Convert RGBA to RGB by compositing onto white in one vectorized pass
+        if img.mode in ("RGBA", "LA", "P"):
+            pixels = np.asarray(img.convert("RGBA"), dtype=np.uint16)
+            rgb, alpha = pixels[..., :3], pixels[..., 3:]
+            flattened = (rgb * alpha + 255 * (255 - alpha) + 127) // 255
+            img = Image.fromarray(flattened.astype(np.uint8), "RGB")
 
         # Apply EXIF orientation
         img = ImageOps.exif_transpose(img)
 
         # Resize if needed
         if max(img.size) > max_dimension:
-            img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+            img.thumbnail((max_dimension, max_dimension), RESAMPLE_FILTER)
 
-        # Save optimized
-        output = BytesIO()
-        img.save(output, format="JPEG", quality=quality, optimize=True)
-        output.seek(0)
+        return SimpleImageOptimizer.encode_jpeg(img, quality)
 
-        return output.getvalue(), "jpeg"
+    @staticmethod
+    def encode_jpeg(img: Image.Image, quality: int = IMAGE_QUALITY) -> bytes:
+        """Encode an image as JPEG, using libjpeg-turbo when available."""
+        if turbo_jpeg is not None and img.mode == "RGB":
+            return turbo_jpeg.encode(
+                np.asarray(img),
+                quality=quality,
+                pixel_format=TJPF_RGB,
+                # TJSAMP_444/422/420 are 0/1/2, matching Pillow's subsampling
+                jpeg_subsample=IMAGE_SUBSAMPLING,
+                flags=TJFLAG_PROGRESSIVE if IMAGE_PROGRESSIVE else 0,
+            )
+
+        # Fall back to Pillow's encoder. storage3 only accepts bytes (a
+        # memoryview would be treated as a file path), so getvalue() is the
+        # single copy made before the upload.
+        output = BytesIO()
+        img.save(
+            output,
+            format="JPEG",
+            quality=quality,
+            optimize=not IMAGE_PROGRESSIVE,  # progressive implies optimized tables
+            progressive=IMAGE_PROGRESSIVE,
+            subsampling=IMAGE_SUBSAMPLING,
+        )
+        return output.getvalue()
 
     @staticmethod
     def get_image_info(image_data: bytes):
@@ -94,7 +188,306 @@ class SimpleImageOptimizer:
         }
 
 
-def optimize_existing_images(dry_run: bool = False, limit: int = None):
+def iter_record_pages(table, page_size: int = DATA_FETCH_PAGE_SIZE):
+    """
+    Fetch records page by page using server-side range pagination.
+
+    Args:
+        table: Supabase table handle
+        page_size: Number of records per request
+
+    Yields:
+        DataFrame with the ID, title and image URL of each page's records
+    """
+    offset = 0
+    while True:
+        response = (
+            table.select(f"{ID_COLUMN},{TITLE_COLUMN},{IMAGE_URL_COLUMN}")
+            .order(ID_COLUMN)
+            .range(offset, offset + page_size - 1)
+            .execute()
+        )
+        if not response.data:
+            return
+
+        yield pd.DataFrame(response.data)
+
+        if len(response.data) < page_size:
+            return
+        offset += page_size
+
+
+def get_remote_size_kb(image_url: str, session) -> Optional[float]:
+    """
+    Get the size of a remote image from a HEAD request, without the body.
+
+    Args:
+        image_url: URL of the image
+        session: requests session used for downloads
+
+    Returns:
+        Size in KB, or None if the server does not report it
+    """
+    try:
+        response = session.head(
+            image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT, allow_redirects=True
+        )
+        response.raise_for_status()
+        content_length = response.headers.get("Content-Length")
+        return int(content_length) / 1024 if content_length else None
+    except (requests.RequestException, ValueError):
+        return None
+
+
+def download_stage(record: dict, session) -> dict:
+    """
+    Pipeline stage 1 (network-bound): download a record's image.
+
+    Args:
+        record: Record dict with ID, title and image URL
+        session: requests session used for downloads
+
+    Returns:
+        Pipeline state dict carrying the record, progress lines and result.
+        "result" stays None while the record still needs further stages.
+    """
+    image_url = record[IMAGE_URL_COLUMN]
+    log = [
+        f"  Title: {record[TITLE_COLUMN]}",
+        f"  Current URL: {image_url[:80]}...",
+    ]
+    state = {"record": record, "log": log, "result": None}
+
+    try:
+        # Skip images that are already small without downloading them
+        if ALREADY_OPTIMIZED_KB:
+            remote_size_kb = get_remote_size_kb(image_url, session)
+            if remote_size_kb is not None and remote_size_kb < ALREADY_OPTIMIZED_KB:
+                log.append(
+                    f"  ⚠ Skipping: Already small ({remote_size_kb:.1f}KB "
+                    f"< {ALREADY_OPTIMIZED_KB}KB)"
+                )
+                state["result"] = "skipped"
+                return state
+
+        # Download current image
+        log.append("  → Downloading image...")
+        response = session.get(image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
+        response.raise_for_status()
+        state["original_data"] = response.content
+    except Exception as e:
+        log.append(f"  ❌ Error: {e}")
+        state["result"] = "failed"
+
+    return state
+
+
+def optimize_stage(state: dict, optimizer: SimpleImageOptimizer) -> dict:
+    """
+    Pipeline stage 2 (CPU-bound): decode, resize and re-encode the image.
+
+    Args:
+        state: Pipeline state from download_stage()
+        optimizer: Image optimizer
+
+    Returns:
+        The updated pipeline state
+    """
+    if state["result"] is not None:
+        return state
+
+    log = state["log"]
+    try:
+        original_data = state.pop("original_data")
+        original_size_kb = len(original_data) / 1024
+
+        # Open the image once for both its info and the optimization
+        img, img_info = optimizer.open_and_info(original_data)
+        log.append(
+            f"  → Original: {img_info['width']}x{img_info['height']} "
+            f"{img_info['format']}, {original_size_kb:.1f}KB"
+        )
+
+        # Optimize image
+        log.append("  → Optimizing...")
+        optimized_data = optimizer.optimize_opened_image(img)
+        optimized_size_kb = len(optimized_data) / 1024
+
+        # Calculate compression ratio (with zero-division protection)
+        if original_size_kb > 0:
+            compression_ratio = (1 - optimized_size_kb / original_size_kb) * 100
+        else:
+            compression_ratio = 0
+
+        log.append(
+            f"  → Optimized: {optimized_size_kb:.1f}KB "
+            f"({compression_ratio:.1f}% reduction)"
+        )
+
+        # Skip if optimization didn't help much (< 10% reduction)
+        if compression_ratio < 10:
+            log.append("  ⚠ Skipping: Less than 10% size reduction")
+            state["result"] = "skipped"
+            return state
+
+        state.update(
+            optimized_data=optimized_data,
+            original_kb=original_size_kb,
+            optimized_kb=optimized_size_kb,
+        )
+    except Exception as e:
+        log.append(f"  ❌ Error: {e}")
+        state["result"] = "failed"
+
+    return state
+
+
+def upload_stage(state: dict, bucket, table, dry_run: bool) -> dict:
+    """
+    Pipeline stage 3 (network-bound): upload the optimized image, sign it
+    and store the new URL.
+
+    Args:
+        state: Pipeline state from optimize_stage()
+        bucket: Supabase storage bucket handle
+        table: Supabase table handle
+        dry_run: If True, skip the upload and the database update
+
+    Returns:
+        The final pipeline state. "result" is "optimized", "skipped" or
+        "failed"; optimized records carry their original/optimized sizes
+        in KB
+    """
+    if state["result"] is not None:
+        return state
+
+    log = state["log"]
+    record = state["record"]
+    optimized_data = state.pop("optimized_data")
+    try:
+        if not dry_run:
+            # Upload optimized image
+            log.append("  → Uploading optimized image...")
+            filename = create_record_filename(
+                record[ID_COLUMN], record[TITLE_COLUMN], ".jpg"
+            )
+            bucket.upload(
+                path=filename,
+                file=optimized_data,
+                file_options={"content-type": "image/jpeg", "upsert": "true"},
+            )
+
+            # Get new signed URL
+            expiry_seconds = 60 * 60 * 24 * 365 * SIGNED_URL_EXPIRY_YEARS
+            signed_url_resp = bucket.create_signed_url(filename, expiry_seconds)
+            if isinstance(signed_url_resp, dict) and "signedURL" in signed_url_resp:
+                new_signed_url = signed_url_resp["signedURL"]
+            else:
+                new_signed_url = signed_url_resp.signedURL
+
+            # Update only the URL column; the stage's worker threads overlap
+            # these round trips on the pooled connection
+            table.update(
+                {IMAGE_URL_COLUMN: new_signed_url}, returning=ReturnMethod.minimal
+            ).eq(ID_COLUMN, record[ID_COLUMN]).execute()
+            log.append("  ✅ Successfully optimized and uploaded!")
+        else:
+            log.append("  ✅ Would optimize and upload (dry-run)")
+
+        state["result"] = "optimized"
+    except Exception as e:
+        log.append(f"  ❌ Error: {e}")
+        state["result"] = "failed"
+
+    return state
+
+
+def failed_state(item: dict, error: Exception) -> dict:
+    """
+    Turn an item whose pipeline stage raised into a failed pipeline state.
+
+    Args:
+        item: Record fed into the first stage, or pipeline state
+        error: Exception raised by the stage
+
+    Returns:
+        The pipeline state, marked as failed
+    """
+    state = item if "log" in item else {"record": item, "log": []}
+    state["log"].append(f"  ❌ Error: {error}")
+    state["result"] = "failed"
+    return state
+
+
+def run_pipeline(
+    items: Iterable,
+    stages: List[Tuple[Callable, int]],
+    queue_size: int,
+    on_error: Callable[[Any, Exception], Any],
+) -> Iterator:
+    """
+    Run items through a chain of stages, each with its own worker threads.
+    Stages are connected by bounded queues, so a slow stage applies
+    backpressure instead of letting finished work pile up in memory.
+
+    Args:
+        items: Items fed into the first stage
+        stages: List of (stage function, number of worker threads)
+        queue_size: Maximum number of items waiting between two stages
+        on_error: Called with (item, exception) when a stage raises; its
+            return value is passed on in place of the stage's output
+
+    Yields:
+        Outputs of the last stage, in completion order
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+
+    def feed():
+        for item in items:
+            queues[0].put(item)
+        queues[0].put(_PIPELINE_DONE)
+
+    def work(stage, inbox, outbox, remaining, lock):
+        try:
+            while (item := inbox.get()) is not _PIPELINE_DONE:
+                try:
+                    output = stage(item)
+                except Exception as e:
+                    output = on_error(item, e)
+                outbox.put(output)
+        finally:
+            # Pass the end marker on to sibling workers, then to the next
+            # stage, even if this worker died, so the consumer never hangs
+            inbox.put(_PIPELINE_DONE)
+            with lock:
+                remaining[0] -= 1
+                if remaining[0] == 0:
+                    outbox.put(_PIPELINE_DONE)
+
+    threads = [threading.Thread(target=feed, daemon=True)]
+    for index, (stage, workers) in enumerate(stages):
+        remaining, lock = [workers], threading.Lock()
+        threads += [
+            threading.Thread(
+                target=work,
+                args=(stage, queues[index], queues[index + 1], remaining, lock),
+                daemon=True,
+            )
+            for _ in range(workers)
+        ]
+    for thread in threads:
+        thread.start()
+
+    while (output := queues[-1].get()) is not _PIPELINE_DONE:
+        yield output
+
+
+def optimize_existing_images(
+    dry_run: bool = False,
+    limit: int = None,
+    workers: int = BATCH_OPTIMIZATION_WORKERS,
+    cpu_workers: int = BATCH_OPTIMIZATION_CPU_WORKERS,
+):
     """Optimize all existing images in Supabase."""
     print("=" * 60)
     print("Supabase Image Batch Optimization Script")
@@ -113,19 +506,44 @@ def optimize_existing_images(dry_run: bool = False, limit: int = None):
     client: Client = create_client(SUPABASE_URL, SUPABASE_KEY)
     optimizer = SimpleImageOptimizer()
 
-    # Fetch all records
+    # Reuse keep-alive connections to the storage host for every download
+    session = create_session(
+        max_retries=Retry(
+            total=IMAGE_DOWNLOAD_RETRIES,
+            backoff_factor=IMAGE_DOWNLOAD_RETRY_BACKOFF,
+            status_forcelist=[502, 503, 504],
+        )
+    )
+
+    # Create the storage and table handles once and share them across records
+    bucket = client.storage.from_(STORAGE_BUCKET)
+    table = client.table(DATA_TABLE)
+
+    # Fetch records page by page, keeping only those with images and titles
     print(f"Fetching {ENTITY_LABEL_PLURAL.lower()} from database...")
-    response = client.table(DATA_TABLE).select("*").execute()
-    df = pd.DataFrame(response.data)
-    print(f"Found {len(df)} total {ENTITY_LABEL_PLURAL.lower()}")
-
-    # Filter only records with image URLs and valid titles
-    df_with_images = df[
-        df[IMAGE_URL_COLUMN].notna()
-        & (df[IMAGE_URL_COLUMN] != "")
-        & df[TITLE_COLUMN].notna()
-        & (df[TITLE_COLUMN] != "")
-    ]
+    fetched_count = 0
+    frames = []
+    for page in iter_record_pages(table):
+        fetched_count += len(page)
+        frames.append(
+            page[
+                page[IMAGE_URL_COLUMN].notna()
+                & (page[IMAGE_URL_COLUMN] != "")
+                & page[TITLE_COLUMN].notna()
+                & (page[TITLE_COLUMN] != "")
+            ]
+        )
+
+        # Stop fetching once enough images are available for --limit
+        if limit and sum(len(frame) for frame in frames) >= limit:
+            break
+
+    df_with_images = (
+        pd.concat(frames, ignore_index=True)
+        if frames
+        else pd.DataFrame(columns=[ID_COLUMN, TITLE_COLUMN, IMAGE_URL_COLUMN])
+    )
+    print(f"Fetched {fetched_count} {ENTITY_LABEL_PLURAL.lower()}")
     print(
         f"Found {len(df_with_images)} {ENTITY_LABEL_PLURAL.lower()} with images and valid titles"
     )
@@ -145,84 +563,36 @@ def optimize_existing_images(dry_run: bool = False, limit: int = None):
     print("Starting optimization process...")
     print("=" * 60 + "\n")
 
-    for idx, (_, row) in enumerate(df_with_images.iterrows(), 1):
-        record_id = row[ID_COLUMN]
-        record_title = row[TITLE_COLUMN]
-        image_url = row[IMAGE_URL_COLUMN]
-
-        print(f"[{idx}/{total}] Processing {ENTITY_LABEL} ID: {record_id}")
-        print(f"  Title: {record_title}")
-        print(f"  Current URL: {image_url[:80]}...")
-
-        try:
-            # Download current image
-            print("  → Downloading image...")
-            response = requests.get(image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
-            response.raise_for_status()
-            original_data = response.content
-            original_size_kb = len(original_data) / 1024
-
-            # Get image info
-            img_info = optimizer.get_image_info(original_data)
-            print(
-                f"  → Original: {img_info['width']}x{img_info['height']} "
-                f"{img_info['format']}, {original_size_kb:.1f}KB"
-            )
-
-            # Optimize image
-            print("  → Optimizing...")
-            optimized_data, optimized_format = optimizer.optimize_image(original_data)
-            optimized_size_kb = len(optimized_data) / 1024
-
-            # Calculate compression ratio (with zero-division protection)
-            if original_size_kb > 0:
-                compression_ratio = (1 - optimized_size_kb / original_size_kb) * 100
-            else:
-                compression_ratio = 0
-
-            print(
-                f"  → Optimized: {optimized_size_kb:.1f}KB "
-                f"({compression_ratio:.1f}% reduction)"
-            )
-
-            # Skip if optimization didn't help much (< 10% reduction)
-            if compression_ratio < 10:
-                print("  ⚠ Skipping: Less than 10% size reduction")
-                continue
-
-            if not dry_run:
-                # Upload optimized image
-                print("  → Uploading optimized image...")
-                filename = create_record_filename(record_id, record_title, ".jpg")
-                bucket = client.storage.from_(STORAGE_BUCKET)
-                bucket.upload(
-                    path=filename,
-                    file=optimized_data,
-                    file_options={"content-type": "image/jpeg", "upsert": "true"},
-                )
+    # Download, optimize and upload in a pipeline: each stage has its own
+    # thread pool, so network-bound and CPU-bound work overlap
+    records = df_with_images[[ID_COLUMN, TITLE_COLUMN, IMAGE_URL_COLUMN]].to_dict(
+        "records"
+    )
+    results = run_pipeline(
+        records,
+        [
+            (partial(download_stage, session=session), workers),
+            (partial(optimize_stage, optimizer=optimizer), cpu_workers),
+            (
+                partial(upload_stage, bucket=bucket, table=table, dry_run=dry_run),
+                workers,
+            ),
+        ],
+        BATCH_PIPELINE_QUEUE_SIZE,
+        failed_state,
+    )
 
-                # Get new signed URL
-                expiry_seconds = 60 * 60 * 24 * 365 * SIGNED_URL_EXPIRY_YEARS
-                signed_url_resp = bucket.create_signed_url(filename, expiry_seconds)
-                if isinstance(signed_url_resp, dict) and "signedURL" in signed_url_resp:
-                    new_signed_url = signed_url_resp["signedURL"]
-                else:
-                    new_signed_url = signed_url_resp.signedURL
-
-                # Update database
-                client.table(DATA_TABLE).update({IMAGE_URL_COLUMN: new_signed_url}).eq(
-                    ID_COLUMN, record_id
-                ).execute()
-                print("  ✅ Successfully optimized and uploaded!")
-            else:
-                print("  ✅ Would optimize and upload (dry-run)")
+    # Results arrive as records finish; each record's lines are printed together
+    for idx, result in enumerate(results, 1):
+        record = result["record"]
+        print(f"[{idx}/{total}] Processing {ENTITY_LABEL} ID: {record[ID_COLUMN]}")
+        print("\n".join(result["log"]))
 
+        if result["result"] == "optimized":
             optimized_count += 1
-            total_original_size += original_size_kb
-            total_optimized_size += optimized_size_kb
-
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
+            total_original_size += result["original_kb"]
+            total_optimized_size += result["optimized_kb"]
+        elif result["result"] == "failed":
             failed_count += 1
 
         print()  # Blank line between records
@@ -267,11 +637,28 @@ if __name__ == "__main__":
     parser.add_argument(
         "--limit", type=int, default=None, help="Only process first N images"
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=BATCH_OPTIMIZATION_WORKERS,
+        help="Threads downloading and uploading images",
+    )
+    parser.add_argument(
+        "--cpu-workers",
+        type=int,
+        default=BATCH_OPTIMIZATION_CPU_WORKERS,
+        help="Threads optimizing images",
+    )
 
     args = parser.parse_args()
 
     try:
-        optimize_existing_images(dry_run=args.dry_run, limit=args.limit)
+        optimize_existing_images(
+            dry_run=args.dry_run,
+            limit=args.limit,
+            workers=args.workers,
+            cpu_workers=args.cpu_workers,
+        )
     except KeyboardInterrupt:
         print("\n\n⚠ Operation cancelled by user")
         sys.exit(1)
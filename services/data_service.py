@@ -3,16 +3,26 @@ Data service module.
 Manages application data state and filtering operations.
 """
 
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
 import pandas as pd
 import panel as pn
 
 from constants.config import (
+    DATA_FETCH_PAGE_SIZE,
     ID_COLUMN,
+    IMAGE_STATUS_BATCH_INTERVAL,
     IMAGE_URL_COLUMN,
+    TABLE_PAGE_SIZE,
     TITLE_COLUMN,
 )
 from services.database_service import DatabaseService
-from utils.image_validator import check_images_parallel
+from utils.image_validator import (
+    clear_status_cache,
+    get_image_status,
+    iter_image_statuses,
+)
 
 
 class DataService:
@@ -27,33 +37,211 @@ class DataService:
         """
         self.db_service = db_service
         self.df = pd.DataFrame()
+        self.total_records = 0
+        self._id_index: Dict[Any, int] = {}  # record ID -> row position
+        self._known_statuses: Dict[Tuple[Any, str], bool] = {}  # (ID, URL) -> status
+        self._record_cache: Dict[Any, Dict[str, Any]] = {}  # record ID -> dict
+        self._display_cache: Dict[str, pd.DataFrame] = {}  # filter -> display rows
         self.id_column = ID_COLUMN
         self.image_url_column = IMAGE_URL_COLUMN
         self.title_column = TITLE_COLUMN
 
-    def load_data(self) -> pd.DataFrame:
+    def load_data(self, recheck: bool = False) -> pd.DataFrame:
         """
-        Load data from database and check image statuses.
+        Load the first page of records from the database.
+        Only one table page is fetched so the UI can render quickly; the
+        remaining records are loaded by fetch_remaining_data(). Records
+        whose image URL is unchanged since the previous load keep their
+        status; all others start as pending (<NA>) and are filled in by
+        iter_status_results().
+
+        Args:
+            recheck: Forget all known statuses so every image is checked again
 
         Returns:
-            DataFrame with records and their image statuses
+            DataFrame with records and pending image statuses
+
+        Raises:
+            Exception: If the first page could not be fetched; the loaded
+                data is reset to an empty table first
         """
-        try:
-            self.df = self.db_service.fetch_records()
+        if recheck:
+            self._known_statuses = {}
+            clear_status_cache()
+        else:
+            # Remember checked statuses so unchanged records are not checked again
+            self._remember_statuses()
 
-            # Ensure image_url column exists
-            if self.image_url_column not in self.df.columns:
-                self.df[self.image_url_column] = ""
+        try:
+            page, total = self.db_service.fetch_page(0, TABLE_PAGE_SIZE)
+            self.total_records = total if total is not None else len(page)
+            self.df = self._prepare_records(page)
+            self._build_id_index()
 
-            # Check image statuses in parallel
             pn.state.notifications.info("Checking image statuses...", duration=2000)
-            statuses = check_images_parallel(self.df[self.image_url_column].tolist())
-            self.df["status"] = statuses
-
             return self.df
-        except Exception as e:
-            pn.state.notifications.error(f"Failed to load data: {e}")
-            return pd.DataFrame()
+        except Exception:
+            # Keep the prepared columns so the empty table still renders
+            empty = pd.DataFrame(
+                columns=[self.id_column, self.title_column, self.image_url_column]
+            )
+            self.df = self._prepare_records(empty)
+            self.total_records = 0
+            self._id_index = {}
+            self._clear_caches()
+            raise
+
+    def has_more_data(self) -> bool:
+        """
+        Check whether records beyond the loaded ones remain in the database.
+
+        Returns:
+            True if more records are available
+        """
+        return len(self.df) < self.total_records
+
+    def fetch_remaining_data(self) -> List[pd.DataFrame]:
+        """
+        Fetch all records after the already loaded ones, page by page.
+        Only performs I/O, so it is safe to call from a worker thread;
+        pass the result to append_records() to update the state.
+
+        Returns:
+            List of DataFrames, one per fetched page
+        """
+        frames = []
+        offset = len(self.df)
+        while offset < self.total_records:
+            page, _ = self.db_service.fetch_page(offset, DATA_FETCH_PAGE_SIZE)
+            if page.empty:
+                break
+            frames.append(self._prepare_records(page))
+            offset += len(page)
+        return frames
+
+    def append_records(self, frames: List[pd.DataFrame]) -> pd.DataFrame:
+        """
+        Append fetched pages to the loaded records.
+        Existing rows keep their index labels.
+
+        Args:
+            frames: Pages returned by fetch_remaining_data()
+
+        Returns:
+            DataFrame with all loaded records
+        """
+        if frames:
+            self.df = pd.concat([self.df, *frames], ignore_index=True)
+            self._build_id_index()
+        return self.df
+
+    def iter_status_results(
+        self,
+        batch_interval: float = IMAGE_STATUS_BATCH_INTERVAL,
+        labels: Optional[pd.Index] = None,
+    ) -> Iterator[Dict[int, bool]]:
+        """
+        Check all pending image statuses, yielding results in batches.
+        Batches are emitted as checks complete, so callers can show
+        statuses progressively instead of waiting for the slowest URL.
+
+        Args:
+            batch_interval: Minimum seconds between yielded batches
+            labels: Only check these rows (e.g., the visible table page)
+
+        Yields:
+            Dicts mapping DataFrame index labels to image statuses
+        """
+        if labels is None:
+            df = self.df
+        else:
+            df = self.df.loc[self.df.index.intersection(labels)]
+        pending = df["status"].isna()
+        labels = df.index[pending]
+        urls = df.loc[pending, self.image_url_column].to_numpy(
+            dtype=object, na_value=""
+        )
+
+        batch = {}
+        last_yield = time.monotonic()
+        for position, status in iter_image_statuses(urls):
+            batch[labels[position]] = status
+            if time.monotonic() - last_yield >= batch_interval:
+                yield batch
+                batch = {}
+                last_yield = time.monotonic()
+
+        if batch:
+            yield batch
+
+    def set_statuses(self, statuses: Dict[int, bool]) -> None:
+        """
+        Store image statuses for the given rows.
+
+        Args:
+            statuses: Dict mapping DataFrame index labels to image statuses
+        """
+        self.df.loc[list(statuses), "status"] = pd.array(
+            list(statuses.values()), dtype="boolean"
+        )
+        self._clear_caches()
+
+    def _build_id_index(self) -> None:
+        """Map record IDs to row positions for constant-time lookups."""
+        self._id_index = {
+            record_id: position
+            for position, record_id in enumerate(self.df[self.id_column].to_numpy())
+        }
+        self._clear_caches()
+
+    def _clear_caches(self, record_id: Any = None) -> None:
+        """
+        Drop cached views of the data after it changed.
+
+        Args:
+            record_id: The only record that changed (drops all records if None)
+        """
+        self._display_cache.clear()
+        if record_id is None:
+            self._record_cache.clear()
+        else:
+            self._record_cache.pop(record_id, None)
+
+    def _remember_statuses(self) -> None:
+        """Store the checked statuses of the loaded records by (ID, URL)."""
+        if self.df.empty:
+            return
+
+        checked = self.df[self.df["status"].notna()]
+        keys = zip(
+            checked[self.id_column].to_numpy(),
+            checked[self.image_url_column].to_numpy(dtype=object, na_value=""),
+        )
+        self._known_statuses = dict(zip(keys, checked["status"].to_numpy()))
+
+    def _prepare_records(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Prepare fetched records for display.
+        Statuses are carried over for records whose (ID, URL) pair was
+        already checked; all other records get a pending status.
+
+        Args:
+            df: Records fetched from the database
+
+        Returns:
+            The same DataFrame with a "status" column added
+        """
+        # Ensure image_url column exists
+        if self.image_url_column not in df.columns:
+            df[self.image_url_column] = ""
+
+        keys = zip(
+            df[self.id_column].to_numpy(),
+            df[self.image_url_column].to_numpy(dtype=object, na_value=""),
+        )
+        statuses = [self._known_statuses.get(key, pd.NA) for key in keys]
+        df["status"] = pd.array(statuses, dtype="boolean")
+        return df
 
     def get_filtered_data(self, status_filter: str) -> pd.DataFrame:
         """
@@ -64,19 +252,20 @@ class DataService:
             status_filter: Filter value ("All", "OK", or "Error")
 
         Returns:
-            Filtered DataFrame
+            Filtered DataFrame (treat as read-only)
         """
         if self.df.empty:
             return pd.DataFrame()
 
-        filtered_df = self.df.copy()
-
+        # Filter without copying; callers only read or slice the result.
+        # Pending (<NA>) statuses match neither "OK" nor "Error".
+        status = self.df["status"]
         if status_filter == "OK":
-            filtered_df = filtered_df[filtered_df["status"]]
+            return self.df[status.to_numpy(dtype=bool, na_value=False)]
         elif status_filter == "Error":
-            filtered_df = filtered_df[~filtered_df["status"]]
+            return self.df[(~status).to_numpy(dtype=bool, na_value=False)]
 
-        return filtered_df
+        return self.df
 
     def get_display_columns(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -98,6 +287,25 @@ class DataService:
             return pd.DataFrame(columns=display_cols)
         return df[display_cols].sort_values(by=self.id_column, ascending=True)
 
+    def get_display_data(self, status_filter: str) -> pd.DataFrame:
+        """
+        Get the display columns of the rows matching a status filter.
+        Results are cached per filter until the data changes, so switching
+        between filters does not slice and sort the records again.
+
+        Args:
+            status_filter: Filter value ("All", "OK", or "Error")
+
+        Returns:
+            DataFrame with display columns only (treat as read-only)
+        """
+        display_df = self._display_cache.get(status_filter)
+        if display_df is None:
+            filtered_df = self.get_filtered_data(status_filter)
+            display_df = self.get_display_columns(filtered_df)
+            self._display_cache[status_filter] = display_df
+        return display_df
+
     def get_record_by_id(self, record_id: int) -> pd.Series:
         """
         Get a specific record by its ID.
@@ -108,7 +316,73 @@ class DataService:
         Returns:
             Series containing the record data
         """
-        return self.df[self.df[self.id_column] == record_id].iloc[0]
+        return self.df.iloc[self._id_index[record_id]]
+
+    def get_record_dict(self, record_id: int) -> Dict[str, Any]:
+        """
+        Get a specific record as a plain dict, with missing values as None.
+        Dicts are cached until the record changes, so repeated lookups (e.g.
+        re-selecting a row) skip building a row Series.
+
+        Args:
+            record_id: The record ID to retrieve
+
+        Returns:
+            Dict mapping column names to values (treat as read-only)
+        """
+        record = self._record_cache.get(record_id)
+        if record is None:
+            position = self._id_index[record_id]
+            record = {}
+            for col in self.df.columns:
+                value = self.df[col].iat[position]
+                record[col] = (
+                    None if pd.api.types.is_scalar(value) and pd.isna(value) else value
+                )
+            self._record_cache[record_id] = record
+        return record
+
+    def has_record(self, record_id: int) -> bool:
+        """
+        Check whether a record is loaded.
+
+        Args:
+            record_id: The record ID to look up
+
+        Returns:
+            True if the record is in the loaded data
+        """
+        return record_id in self._id_index
+
+    def get_record_label(self, record_id: int) -> Any:
+        """
+        Get the DataFrame index label of a record.
+
+        Args:
+            record_id: The record ID to look up
+
+        Returns:
+            Index label of the record's row
+        """
+        return self.df.index[self._id_index[record_id]]
+
+    def update_record(self, record_id: int, values: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Update fields of a single record in place.
+
+        Args:
+            record_id: The record ID to update
+            values: Dict mapping column names to new values
+
+        Returns:
+            Dict with the previous values of the updated columns
+        """
+        label = self.get_record_label(record_id)
+        previous = {col: self.df.at[label, col] for col in values}
+        for col, value in values.items():
+            self.df.at[label, col] = value
+        self._clear_caches(record_id)
+        return previous
 
     def refresh_record_status(self, record_id: int) -> None:
         """
@@ -117,10 +391,9 @@ class DataService:
         Args:
             record_id: The record ID to refresh
         """
-        idx = self.df[self.df[self.id_column] == record_id].index[0]
-        url = self.df.loc[idx, self.image_url_column]
-
-        from utils.image_validator import get_image_status
+        position = self._id_index[record_id]
+        url = self.df.iat[position, self.df.columns.get_loc(self.image_url_column)]
 
         new_status = get_image_status(url)
-        self.df.loc[idx, "status"] = new_status
+        self.df.iat[position, self.df.columns.get_loc("status")] = bool(new_status)
+        self._clear_caches(record_id)
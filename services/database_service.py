@@ -3,16 +3,64 @@ Database service module.
 Handles all interactions with Supabase database and storage.
 """
 
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+import httpx
 import pandas as pd
-from supabase import Client, create_client
+from postgrest.types import ReturnMethod
+from supabase import Client, ClientOptions, create_client
 
 from constants.config import (
+    ADDITIONAL_DISPLAY_COLUMNS,
+    DATA_FETCH_PAGE_SIZE,
     DATA_TABLE,
     ID_COLUMN,
     IMAGE_URL_COLUMN,
+    SIGNED_URL_CACHE_SIZE,
+    SIGNED_URL_REFRESH_RATIO,
     STORAGE_BUCKET,
     SUPABASE_KEY,
+    SUPABASE_POOL_KEEPALIVE,
+    SUPABASE_POOL_KEEPALIVE_EXPIRY,
+    SUPABASE_POOL_MAX_CONNECTIONS,
+    SUPABASE_REQUEST_TIMEOUT,
     SUPABASE_URL,
+    THUMBNAIL_URL_COLUMN,
+    TITLE_COLUMN,
+)
+
+# Optional columnar builder for query results
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+# Arrow string types converted to pandas' string dtype instead of object
+_ARROW_STRING_TYPES = (
+    {pa.string(): pd.StringDtype(), pa.large_string(): pd.StringDtype()}
+    if pa is not None
+    else {}
+)
+
+# Signed URLs shared by all sessions in the process:
+# (bucket, file path, expiry) -> (signed URL response, signed at)
+_signed_url_cache: OrderedDict = OrderedDict()
+_signed_url_lock = threading.Lock()
+
+# Connection pool shared by the Supabase clients of all sessions, so
+# uploads, updates and signing requests run on parallel connections
+_supabase_http = httpx.Client(
+    http2=True,
+    limits=httpx.Limits(
+        max_connections=SUPABASE_POOL_MAX_CONNECTIONS,
+        max_keepalive_connections=SUPABASE_POOL_KEEPALIVE,
+        keepalive_expiry=SUPABASE_POOL_KEEPALIVE_EXPIRY,
+    ),
+    timeout=SUPABASE_REQUEST_TIMEOUT,
+    follow_redirects=True,
 )
 
 
@@ -26,33 +74,162 @@ class DatabaseService:
 
         self.url = SUPABASE_URL
         self.key = SUPABASE_KEY
-        self.client: Client = create_client(self.url, self.key)
+        self.client: Client = create_client(
+            self.url, self.key, options=ClientOptions(httpx_client=_supabase_http)
+        )
         self.data_table = DATA_TABLE
         self.bucket_name = STORAGE_BUCKET
+
+        # Reusable table and bucket handles; each query builds its own request
+        self._table = self.client.table(self.data_table)
+        self._bucket = self.client.storage.from_(self.bucket_name)
+
         self.id_column = ID_COLUMN
         self.image_url_column = IMAGE_URL_COLUMN
+        self.thumbnail_url_column = THUMBNAIL_URL_COLUMN
+
+        # Fetch only the columns the app uses instead of select("*")
+        columns = [
+            ID_COLUMN,
+            TITLE_COLUMN,
+            IMAGE_URL_COLUMN,
+            THUMBNAIL_URL_COLUMN,
+            *ADDITIONAL_DISPLAY_COLUMNS,
+        ]
+        self.columns = list(dict.fromkeys(col for col in columns if col))
+
+        # Text columns stored with pandas' string dtype
+        self.text_columns = [
+            col
+            for col in (TITLE_COLUMN, IMAGE_URL_COLUMN, THUMBNAIL_URL_COLUMN)
+            if col and col != ID_COLUMN
+        ]
 
-    def fetch_records(self) -> pd.DataFrame:
+    def fetch_records(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
         """
         Fetch all records from the configured database table.
+        Only the requested columns are selected, and records are fetched in
+        pages of DATA_FETCH_PAGE_SIZE so no single response holds the whole
+        table.
+
+        Args:
+            columns: Columns to fetch (defaults to the configured columns)
 
         Returns:
             DataFrame containing all records
         """
-        response = self.client.table(self.data_table).select("*").execute()
-        return pd.DataFrame(response.data)
+        columns = columns or self.columns
+        frames = []
+        offset = 0
+        while True:
+            response = self._select_range(
+                columns, offset, DATA_FETCH_PAGE_SIZE
+            ).execute()
+            if not response.data:
+                break
+
+            frames.append(self._to_dataframe(response.data, columns))
+            if len(response.data) < DATA_FETCH_PAGE_SIZE:
+                break
+            offset += DATA_FETCH_PAGE_SIZE
+
+        if not frames:
+            return self._to_dataframe([], columns)
+        return pd.concat(frames, ignore_index=True)
+
+    def fetch_page(
+        self, offset: int, limit: int, columns: Optional[List[str]] = None
+    ) -> Tuple[pd.DataFrame, Optional[int]]:
+        """
+        Fetch a single page of records using server-side range pagination.
+        Records are ordered by ID so consecutive pages never overlap.
 
-    def update_image_url(self, record_id: int, image_url: str) -> None:
+        Args:
+            offset: Index of the first record to fetch
+            limit: Maximum number of records to fetch
+            columns: Columns to fetch (defaults to the configured columns)
+
+        Returns:
+            Tuple of (DataFrame with the page's records, total record count)
+        """
+        columns = columns or self.columns
+        response = self._select_range(columns, offset, limit, count="exact").execute()
+        return self._to_dataframe(response.data, columns), response.count
+
+    def _select_range(
+        self, columns: List[str], offset: int, limit: int, count: Optional[str] = None
+    ):
         """
-        Update the image URL for a specific record.
+        Build a query for a range of records ordered by ID.
+
+        Args:
+            columns: Columns to select
+            offset: Index of the first record to fetch
+            limit: Maximum number of records to fetch
+            count: Optional PostgREST count method (e.g. "exact")
+
+        Returns:
+            Query builder, ready to execute
+        """
+        return (
+            self._table.select(",".join(columns), count=count)
+            .order(self.id_column)
+            .range(offset, offset + limit - 1)
+        )
+
+    def _to_dataframe(
+        self, data: list, columns: Optional[List[str]] = None
+    ) -> pd.DataFrame:
+        """
+        Build a DataFrame with a fixed column order and explicit dtypes.
+        Text columns use pandas' string dtype (Arrow-backed when pyarrow is
+        installed) instead of generic object columns, and numeric IDs use the
+        nullable Int64 dtype so a missing value never turns them into floats.
+        With pyarrow installed, records are converted column by column by
+        Arrow rather than row by row by pandas.
+
+        Args:
+            data: Records returned by Supabase
+            columns: Columns of the records (defaults to the configured columns)
+
+        Returns:
+            DataFrame with the given columns
+        """
+        columns = columns or self.columns
+        if pa is not None and data:
+            # Build columns with Arrow instead of converting row by row
+            table = pa.Table.from_pylist(data).select(columns)
+            df = table.to_pandas(types_mapper=_ARROW_STRING_TYPES.get)
+        else:
+            df = pd.DataFrame.from_records(data, columns=columns)
+        dtypes = {col: "string" for col in self.text_columns if col in columns}
+
+        # Only numeric IDs are cast; text IDs (e.g. UUIDs) are kept as they are
+        if self.id_column in columns and df[self.id_column].dtype.kind in "iuf":
+            dtypes[self.id_column] = "Int64"
+
+        return df.astype(dtypes)
+
+    def update_image_url(
+        self, record_id: int, image_url: str, thumbnail_url: Optional[str] = None
+    ) -> None:
+        """
+        Update the image URL (and optionally thumbnail URL) for a specific record.
 
         Args:
             record_id: The record ID to update
             image_url: The new image URL
+            thumbnail_url: The new thumbnail URL (stored only if a thumbnail
+                column is configured)
         """
-        self.client.table(self.data_table).update(
-            {self.image_url_column: image_url}
-        ).eq(self.id_column, record_id).execute()
+        values = {self.image_url_column: image_url}
+        if thumbnail_url and self.thumbnail_url_column:
+            values[self.thumbnail_url_column] = thumbnail_url
+
+        # The updated row isn't used, so don't have PostgREST send it back
+        self._table.update(values, returning=ReturnMethod.minimal).eq(
+            self.id_column, record_id
+        ).execute()
 
     def upload_image(
         self, file_data: bytes, file_name: str, content_type: str = "image/jpeg"
@@ -68,8 +245,7 @@ class DatabaseService:
         Returns:
             Upload response from Supabase
         """
-        bucket = self.client.storage.from_(self.bucket_name)
-        response = bucket.upload(
+        response = self._bucket.upload(
             path=file_name,
             file=file_data,
             file_options={"content-type": content_type, "upsert": "true"},
@@ -79,6 +255,9 @@ class DatabaseService:
     def get_signed_url(self, file_path: str, expiry_seconds: int):
         """
         Generate a signed URL for a file in storage.
+        URLs are cached per file path in a process-wide cache shared by all
+        sessions, and only re-signed once most of their lifetime has passed,
+        since signing the same path again is pointless.
 
         Args:
             file_path: Path to the file in the bucket
@@ -87,6 +266,24 @@ class DatabaseService:
         Returns:
             Dict containing the signed URL
         """
-        return self.client.storage.from_(self.bucket_name).create_signed_url(
-            file_path, expiry_seconds
-        )
+        key = (self.bucket_name, file_path, expiry_seconds)
+        with _signed_url_lock:
+            cached = _signed_url_cache.get(key)
+            if cached is not None:
+                response, signed_at = cached
+                age = time.time() - signed_at
+                if age < expiry_seconds * SIGNED_URL_REFRESH_RATIO:
+                    _signed_url_cache.move_to_end(key)
+                    return response
+
+        # Sign outside the lock so slow requests don't block other sessions
+        response = self._bucket.create_signed_url(file_path, expiry_seconds)
+
+        # Keep the most recently used URLs only
+        with _signed_url_lock:
+            _signed_url_cache[key] = (response, time.time())
+            _signed_url_cache.move_to_end(key)
+            if len(_signed_url_cache) > SIGNED_URL_CACHE_SIZE:
+                _signed_url_cache.popitem(last=False)
+
+        return response
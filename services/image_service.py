@@ -3,20 +3,107 @@ Image service module.
 Handles image upload, URL fetching, and image processing operations.
 """
 
-import requests
+import multiprocessing
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import httpx
+import panel as pn
 
 from constants.config import (
+    ALREADY_OPTIMIZED_KB,
     ENABLE_IMAGE_OPTIMIZATION,
+    HTTP_POOL_MAXSIZE,
+    IMAGE_DOWNLOAD_CHUNK_SIZE,
+    IMAGE_DOWNLOAD_MAX_BYTES,
     IMAGE_DOWNLOAD_TIMEOUT,
+    IMAGE_MAX_DIMENSION,
+    IMAGE_OPTIMIZATION_PROCESSES,
+    IMAGE_OPTIMIZATION_WORKERS,
+    IMAGE_URL_COLUMN,
+    OPTIMIZED_CACHE_SIZE,
+    PREVIEW_FORMAT,
     SIGNED_URL_EXPIRY_YEARS,
+    THUMBNAIL_FOLDER,
+    THUMBNAIL_URL_COLUMN,
+    UPLOAD_CONCURRENCY,
 )
 from services.database_service import DatabaseService
+from utils.async_runner import run_sync
 from utils.file_helpers import (
+    CONTENT_TYPE_MAP,
     create_record_filename,
-    get_content_type,
     get_extension_from_url,
 )
 from utils.image_optimizer import ImageOptimizer
+from utils.image_probe import probe_jpeg
+
+# Limits uploads writing to storage and the database across all sessions
+_upload_slots = threading.BoundedSemaphore(UPLOAD_CONCURRENCY)
+
+# Workers shared by all sessions: image optimization is CPU-bound (the JPEG
+# codecs release the GIL), thumbnails overlap with the main upload.
+# Worker processes keep the rest of the optimizer's Python code off the
+# server's GIL; forkserver avoids forking the threaded server process
+# (spawn where forkserver is unavailable, e.g. on Windows).
+if IMAGE_OPTIMIZATION_PROCESSES:
+    _start_method = (
+        "forkserver"
+        if "forkserver" in multiprocessing.get_all_start_methods()
+        else "spawn"
+    )
+    _optimizer_pool = ProcessPoolExecutor(
+        max_workers=IMAGE_OPTIMIZATION_WORKERS,
+        mp_context=multiprocessing.get_context(_start_method),
+    )
+else:
+    _optimizer_pool = ThreadPoolExecutor(
+        max_workers=IMAGE_OPTIMIZATION_WORKERS, thread_name_prefix="image-optimizer"
+    )
+_thumbnail_pool = ThreadPoolExecutor(
+    max_workers=UPLOAD_CONCURRENCY, thread_name_prefix="image-thumbnail"
+)
+
+# Extension of stored thumbnails
+_THUMBNAIL_EXTENSION = ".webp" if PREVIEW_FORMAT.upper() == "WEBP" else ".jpg"
+
+# Recently optimized uploads shared by all sessions, so uploading the same
+# file again (e.g., a retry) skips decoding and encoding:
+# content hash -> (optimized bytes, thumbnail bytes or None)
+_optimized_cache: OrderedDict = OrderedDict()
+_optimized_lock = threading.Lock()
+
+# HTTP/2 client for URL uploads shared by all sessions, bound to the async
+# runner's event loop on first use
+_download_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_download_client() -> httpx.AsyncClient:
+    """
+    Get the shared download client, creating it on first use.
+    Must be called from the async runner's event loop, which owns the
+    client's connections.
+
+    Returns:
+        AsyncClient reusing kept-alive connections across uploads
+    """
+    global _download_client
+    if _download_client is None:
+        limits = httpx.Limits(
+            max_connections=HTTP_POOL_MAXSIZE,
+            max_keepalive_connections=HTTP_POOL_MAXSIZE,
+        )
+        _download_client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
+            timeout=IMAGE_DOWNLOAD_TIMEOUT,
+            follow_redirects=True,
+        )
+    return _download_client
 
 
 class ImageService:
@@ -31,12 +118,17 @@ class ImageService:
         """
         self.db_service = db_service
         self.optimizer = ImageOptimizer()
+        self.image_url_column = IMAGE_URL_COLUMN
+        self.thumbnail_url_column = THUMBNAIL_URL_COLUMN
+
+        # Reads the URL from a signing response; chosen on the first response
+        self._extract_signed_url: Optional[Callable[[Any], str]] = None
 
     def process_file_upload(
         self, record_id: int, record_title: str, file_data: bytes, filename: str
-    ) -> str:
+    ) -> Dict[str, str]:
         """
-        Process a file upload and return the signed URL.
+        Process a file upload and link it to the record.
         Automatically optimizes images before uploading.
 
         Args:
@@ -46,76 +138,41 @@ class ImageService:
             filename: Original filename
 
         Returns:
-            Signed URL for the uploaded image
+            Dict mapping the updated URL columns to their new values
         """
-        import os
-
         # Validate file data is not empty
         if not file_data or len(file_data) == 0:
             raise ValueError("File data is empty or corrupt")
 
-        # Optimize image if enabled
-        if ENABLE_IMAGE_OPTIMIZATION:
-            try:
-                # Get original size for logging
-                original_size = len(file_data) / 1024  # KB
-
-                # Optimize the image
-                optimized_data, optimized_format = self.optimizer.optimize_image(
-                    file_data
-                )
-
-                # Calculate compression ratio (with zero-division protection)
-                optimized_size = len(optimized_data) / 1024  # KB
-                if original_size > 0:
-                    compression_ratio = (1 - optimized_size / original_size) * 100
-                else:
-                    compression_ratio = 0
-
-                # Log optimization results
-                import panel as pn
-
-                pn.state.notifications.info(
-                    f"Image optimized: {original_size:.1f}KB → {optimized_size:.1f}KB "
-                    f"({compression_ratio:.1f}% reduction)",
-                    duration=3000,
-                )
+        ext = os.path.splitext(filename)[1].lower()
+        thumbnail_data = None
 
-                # Use optimized data and force JPEG extension
-                file_data = optimized_data
+        # Optimize image if enabled (small JPEGs are uploaded as they are)
+        if ENABLE_IMAGE_OPTIMIZATION:
+            if self._is_already_optimized(file_data):
                 ext = ".jpg"
-            except Exception as e:
-                # If optimization fails, fall back to original
-                import panel as pn
-
-                pn.state.notifications.warning(
-                    f"Image optimization failed, using original: {e}", duration=3000
-                )
-                ext = os.path.splitext(filename)[1].lower()
-        else:
-            ext = os.path.splitext(filename)[1].lower()
+            else:
+                optimized = self._optimize_upload(file_data)
+                if optimized is not None:
+                    # Use optimized data and force JPEG extension
+                    file_data, thumbnail_data = optimized
+                    ext = ".jpg"
 
-        content_type = get_content_type(ext)
+        content_type = CONTENT_TYPE_MAP.get(ext, "image/jpeg")
 
         # Create standardized filename
         new_filename = create_record_filename(record_id, record_title, ext)
 
-        # Upload to storage
-        self.db_service.upload_image(file_data, new_filename, content_type)
-
-        # Get signed URL
-        signed_url = self._get_signed_url(new_filename)
-
-        # Update database
-        self.db_service.update_image_url(record_id, signed_url)
-
-        return signed_url
+        # Upload, sign and link the image (and its thumbnail)
+        return self._store_and_link(
+            record_id, file_data, new_filename, content_type, thumbnail_data
+        )
 
     def process_url_upload(
         self, record_id: int, record_title: str, image_url: str
-    ) -> str:
+    ) -> Dict[str, str]:
         """
-        Download an image from URL, upload it, and return the signed URL.
+        Download an image from URL, upload it, and link it to the record.
         Automatically optimizes images before uploading.
 
         Args:
@@ -124,81 +181,293 @@ class ImageService:
             image_url: URL of the image to download
 
         Returns:
-            Signed URL for the uploaded image
+            Dict mapping the updated URL columns to their new values
 
         Raises:
             Exception: If download or upload fails
         """
         try:
             # Download the image
-            response = requests.get(image_url, timeout=IMAGE_DOWNLOAD_TIMEOUT)
-            response.raise_for_status()
-            image_data = response.content
+            image_data, response_content_type = self._download_image(image_url)
 
             # Validate image data is not empty
             if not image_data or len(image_data) == 0:
                 raise ValueError("Downloaded image is empty or URL returned no content")
 
-            # Optimize image if enabled
+            ext = get_extension_from_url(image_url)
+            content_type = response_content_type
+            thumbnail_data = None
+
+            # Optimize image if enabled (small JPEGs are uploaded as they are)
             if ENABLE_IMAGE_OPTIMIZATION:
-                try:
-                    # Get original size
-                    original_size = len(image_data) / 1024  # KB
+                if self._is_already_optimized(image_data):
+                    ext = ".jpg"
+                    content_type = "image/jpeg"
+                else:
+                    optimized = self._optimize_upload(image_data)
+                    if optimized is not None:
+                        # Use optimized data and force JPEG
+                        image_data, thumbnail_data = optimized
+                        ext = ".jpg"
+                        content_type = "image/jpeg"
 
-                    # Optimize the image
-                    optimized_data, optimized_format = self.optimizer.optimize_image(
-                        image_data
-                    )
+            # Create standardized filename
+            new_filename = create_record_filename(record_id, record_title, ext)
 
-                    # Calculate compression ratio (with zero-division protection)
-                    optimized_size = len(optimized_data) / 1024  # KB
-                    if original_size > 0:
-                        compression_ratio = (1 - optimized_size / original_size) * 100
-                    else:
-                        compression_ratio = 0
+            # Upload, sign and link the image (and its thumbnail)
+            return self._store_and_link(
+                record_id, image_data, new_filename, content_type, thumbnail_data
+            )
 
-                    # Log optimization results
-                    import panel as pn
+        except Exception as e:
+            raise Exception(f"Failed to download or upload image: {e}")
 
-                    pn.state.notifications.info(
-                        f"Image optimized: {original_size:.1f}KB → {optimized_size:.1f}KB "
-                        f"({compression_ratio:.1f}% reduction)",
-                        duration=3000,
-                    )
+    @staticmethod
+    def _is_already_optimized(image_data: bytes) -> bool:
+        """
+        Check whether an image is a JPEG that is already small enough.
+        Dimensions are read from the JPEG header, so no pixels are decoded.
 
-                    # Use optimized data and force JPEG
-                    image_data = optimized_data
-                    ext = ".jpg"
-                    content_type = "image/jpeg"
-                except Exception as e:
-                    # Fall back to original
-                    import panel as pn
+        Args:
+            image_data: Image data as bytes
+
+        Returns:
+            True if the image is a JPEG under ALREADY_OPTIMIZED_KB that fits
+            within IMAGE_MAX_DIMENSION
+        """
+        if len(image_data) >= ALREADY_OPTIMIZED_KB * 1024:
+            return False
 
+        size = probe_jpeg(image_data)
+        return size is not None and max(size) <= IMAGE_MAX_DIMENSION
+
+    def _linked_values(
+        self, signed_url: str, thumbnail_url: Optional[str]
+    ) -> Dict[str, str]:
+        """
+        Build the column values written by update_image_url().
+
+        Args:
+            signed_url: Signed URL of the uploaded image
+            thumbnail_url: Signed URL of the thumbnail, if one was created
+
+        Returns:
+            Dict mapping column names to their new values
+        """
+        values = {self.image_url_column: signed_url}
+        if thumbnail_url and self.thumbnail_url_column:
+            values[self.thumbnail_url_column] = thumbnail_url
+        return values
+
+    def _optimize_upload(
+        self, image_data: bytes
+    ) -> Optional[Tuple[bytes, Optional[bytes]]]:
+        """
+        Optimize an uploaded image on the shared optimizer workers.
+        Running on a bounded pool limits the CPU spent on optimization when
+        several sessions upload at the same time. The size reduction is only
+        worked out when there is a session to show it to.
+
+        Args:
+            image_data: Original image data as bytes
+
+        Returns:
+            Tuple of (optimized JPEG bytes, thumbnail bytes or None), or None
+            if optimization failed and the original image should be uploaded
+        """
+        notifications = pn.state.notifications
+        try:
+            optimized_data, thumbnail_data = self._optimize_images(image_data)
+        except Exception as e:
+            # If optimization fails, fall back to original
+            if notifications is not None:
+                notifications.warning(
+                    f"Image optimization failed, using original: {e}", duration=3000
+                )
+            return None
+
+        # Log optimization results
+        if notifications is not None:
+            original_size = len(image_data) / 1024  # KB
+            optimized_size = len(optimized_data) / 1024  # KB
+            compression_ratio = (1 - optimized_size / original_size) * 100
+            notifications.info(
+                f"Image optimized: {original_size:.1f}KB → {optimized_size:.1f}KB "
+                f"({compression_ratio:.1f}% reduction)",
+                duration=3000,
+            )
+
+        return optimized_data, thumbnail_data
+
+    def _optimize_images(self, image_data: bytes) -> Tuple[bytes, Optional[bytes]]:
+        """
+        Optimize an image on the shared optimizer workers, creating its
+        thumbnail from the same decode when thumbnails are stored. Files
+        identical to a recent upload reuse its results.
+
+        Args:
+            image_data: Original image data as bytes
+
+        Returns:
+            Tuple of (optimized JPEG bytes, thumbnail bytes or None)
+        """
+        key = self.optimizer.content_hash(image_data)
+        with _optimized_lock:
+            cached = _optimized_cache.get(key)
+            if cached is not None:
+                _optimized_cache.move_to_end(key)
+                return cached
+
+        if THUMBNAIL_URL_COLUMN:
+            result = _optimizer_pool.submit(
+                self.optimizer.optimize_and_thumbnail, image_data
+            ).result()
+        else:
+            optimized = _optimizer_pool.submit(
+                self.optimizer.optimize_image, image_data
+            )
+            result = optimized.result(), None
+
+        # Remember the result, dropping the least recently used one when full
+        with _optimized_lock:
+            _optimized_cache[key] = result
+            if len(_optimized_cache) > OPTIMIZED_CACHE_SIZE:
+                _optimized_cache.popitem(last=False)
+        return result
+
+    def _store_and_link(
+        self,
+        record_id: int,
+        image_data: bytes,
+        filename: str,
+        content_type: str,
+        thumbnail_data: Optional[bytes] = None,
+    ) -> Dict[str, str]:
+        """
+        Upload an image, sign it and link it to the record.
+        The thumbnail (if configured) is created, uploaded and signed on a
+        worker thread while the full image is uploaded and signed, so the
+        two storage round-trips overlap. At most UPLOAD_CONCURRENCY uploads
+        do this at once; further uploads wait for a free slot.
+
+        Args:
+            record_id: Record ID for the image
+            image_data: Image data to upload
+            filename: Storage filename of the image
+            content_type: MIME type of the image
+            thumbnail_data: Thumbnail made while optimizing (created from
+                image_data if None)
+
+        Returns:
+            Dict mapping the updated URL columns to their new values
+        """
+        with _upload_slots:
+            # Start the thumbnail while the full image uploads
+            thumbnail_future = None
+            if THUMBNAIL_URL_COLUMN:
+                thumbnail_future = _thumbnail_pool.submit(
+                    self._upload_thumbnail, image_data, filename, thumbnail_data
+                )
+
+            try:
+                # Upload to storage
+                self.db_service.upload_image(image_data, filename, content_type)
+
+                # Get signed URL
+                signed_url = self._get_signed_url(filename)
+            except Exception:
+                if thumbnail_future:
+                    thumbnail_future.cancel()
+                raise
+
+            # Wait for the thumbnail; its failures never block the main upload
+            thumbnail_url = None
+            if thumbnail_future:
+                try:
+                    thumbnail_url = thumbnail_future.result()
+                except Exception as e:
                     pn.state.notifications.warning(
-                        f"Image optimization failed, using original: {e}", duration=3000
+                        f"Thumbnail creation failed: {e}", duration=3000
                     )
-                    ext = get_extension_from_url(image_url)
-                    content_type = response.headers.get("Content-Type", "image/jpeg")
-            else:
-                ext = get_extension_from_url(image_url)
-                content_type = response.headers.get("Content-Type", "image/jpeg")
 
-            # Create standardized filename
-            new_filename = create_record_filename(record_id, record_title, ext)
+            # Update database
+            self.db_service.update_image_url(record_id, signed_url, thumbnail_url)
 
-            # Upload to storage
-            self.db_service.upload_image(image_data, new_filename, content_type)
+        return self._linked_values(signed_url, thumbnail_url)
 
-            # Get signed URL
-            signed_url = self._get_signed_url(new_filename)
+    def _upload_thumbnail(
+        self,
+        image_data: bytes,
+        filename: str,
+        thumbnail_data: Optional[bytes] = None,
+    ) -> str:
+        """
+        Upload a thumbnail next to the full image and sign it.
 
-            # Update database
-            self.db_service.update_image_url(record_id, signed_url)
+        Args:
+            image_data: Image data that was uploaded as the full-size image
+            filename: Storage filename of the full-size image
+            thumbnail_data: Ready-made thumbnail (created from image_data if None)
 
-            return signed_url
+        Returns:
+            Signed thumbnail URL
+        """
+        if thumbnail_data is None:
+            thumbnail_data = self.optimizer.create_thumbnail(image_data)
+        base_name = os.path.splitext(filename)[0]
+        thumbnail_filename = f"{THUMBNAIL_FOLDER}/{base_name}{_THUMBNAIL_EXTENSION}"
 
-        except Exception as e:
-            raise Exception(f"Failed to download or upload image: {e}")
+        self.db_service.upload_image(
+            thumbnail_data, thumbnail_filename, CONTENT_TYPE_MAP[_THUMBNAIL_EXTENSION]
+        )
+        return self._get_signed_url(thumbnail_filename)
+
+    def _download_image(self, image_url: str) -> Tuple[bytes, str]:
+        """
+        Download an image from a URL, blocking until it has arrived.
+        The download itself runs on the shared async client (see
+        _download_image_async).
+
+        Args:
+            image_url: URL of the image to download
+
+        Returns:
+            Tuple of (image bytes, content type reported by the server)
+        """
+        return run_sync(self._download_image_async(image_url))
+
+    async def _download_image_async(self, image_url: str) -> Tuple[bytes, str]:
+        """
+        Stream an image from a URL with a size cap.
+
+        Args:
+            image_url: URL of the image to download
+
+        Returns:
+            Tuple of (image bytes, content type reported by the server)
+
+        Raises:
+            ValueError: If the image exceeds IMAGE_DOWNLOAD_MAX_BYTES
+        """
+        max_mb = IMAGE_DOWNLOAD_MAX_BYTES / (1024 * 1024)
+
+        client = _get_download_client()
+        async with client.stream("GET", image_url) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("Content-Type", "image/jpeg")
+
+            # Reject early when the server announces an oversized body
+            content_length = response.headers.get("Content-Length")
+            if content_length and int(content_length) > IMAGE_DOWNLOAD_MAX_BYTES:
+                raise ValueError(f"Image is larger than {max_mb:.0f}MB")
+
+            buffer = bytearray()
+            async for chunk in response.aiter_bytes(IMAGE_DOWNLOAD_CHUNK_SIZE):
+                buffer.extend(chunk)
+                if len(buffer) > IMAGE_DOWNLOAD_MAX_BYTES:
+                    raise ValueError(f"Image is larger than {max_mb:.0f}MB")
+
+        return bytes(buffer), content_type
 
     def _get_signed_url(self, filename: str) -> str:
         """
@@ -213,10 +482,26 @@ class ImageService:
         expiry_seconds = 60 * 60 * 24 * 365 * SIGNED_URL_EXPIRY_YEARS
         signed_url_resp = self.db_service.get_signed_url(filename, expiry_seconds)
 
-        # Handle different response formats
-        if isinstance(signed_url_resp, dict) and "signedURL" in signed_url_resp:
-            return signed_url_resp["signedURL"]
-        elif hasattr(signed_url_resp, "signedURL"):
-            return signed_url_resp.signedURL
-        else:
-            return signed_url_resp["signedURL"]
+        # The response format is the same for every call, so detect it once
+        if self._extract_signed_url is None:
+            self._extract_signed_url = self._signed_url_extractor(signed_url_resp)
+        return self._extract_signed_url(signed_url_resp)
+
+    @staticmethod
+    def _signed_url_extractor(signed_url_resp: Any) -> Callable[[Any], str]:
+        """
+        Pick the accessor for the URL in a signing response.
+        Depending on the storage client version, the response is a dict or
+        an object with a signedURL attribute.
+
+        Args:
+            signed_url_resp: Response returned by the storage client
+
+        Returns:
+            Function that reads the signed URL from a response
+        """
+        if not isinstance(signed_url_resp, dict) and hasattr(
+            signed_url_resp, "signedURL"
+        ):
+            return attrgetter("signedURL")
+        return itemgetter("signedURL")
@@ -3,19 +3,33 @@ UI callbacks module.
 Contains all event handlers and callback functions for UI interactions.
 """
 
+import threading
+import time
+from concurrent.futures import Future
+from functools import partial
+from operator import itemgetter
+
+import pandas as pd
 import panel as pn
+from panel.io.state import set_curdoc
 
 from constants.config import (
     ADDITIONAL_DISPLAY_COLUMNS,
     ENTITY_LABEL,
     ID_COLUMN,
     IMAGE_URL_COLUMN,
+    REFRESH_MIN_INTERVAL,
+    THUMBNAIL_URL_COLUMN,
     TITLE_COLUMN,
+    UI_UPDATE_TIMEOUT,
 )
 from services.data_service import DataService
 from services.image_service import ImageService
 from ui.components import UIComponents
 
+# Markdown line for one field of the selected record
+INFO_LINE_TEMPLATE = "**{label}:** {value}"
+
 
 class UICallbacks:
     """Manages all UI event callbacks and interactions."""
@@ -35,13 +49,38 @@ class UICallbacks:
         self.data_service = data_service
         self.image_service = image_service
         self.sidebar = None  # Will be set after layout creation
+        self._load_generation = 0  # Incremented on every reload
+        self._last_load_started = None  # time.monotonic() of the last reload
+        self._updating_table = False  # True while _set_table() runs
 
         # Store column configuration
         self.id_column = ID_COLUMN
         self.title_column = TITLE_COLUMN
         self.image_url_column = IMAGE_URL_COLUMN
+        self.thumbnail_url_column = THUMBNAIL_URL_COLUMN
         self.additional_columns = ADDITIONAL_DISPLAY_COLUMNS
 
+        # Editor labels only depend on the configuration, so build them once
+        id_label = (
+            self.id_column.upper()
+            if len(self.id_column) <= 3
+            else self.id_column.replace("_", " ").title()
+        )
+        self._info_labels = [
+            id_label,
+            self.title_column.replace("_", " ").title(),
+            f"Current {self.image_url_column.replace('_', ' ').title()}",
+            *(col.replace("_", " ").title() for col in self.additional_columns),
+        ]
+
+        # Reads the labelled fields from a record dict in one call
+        self._info_getter = itemgetter(
+            self.id_column,
+            self.title_column,
+            self.image_url_column,
+            *self.additional_columns,
+        )
+
     def set_sidebar(self, sidebar: pn.Column):
         """
         Set the sidebar reference for component updates.
@@ -55,29 +94,238 @@ class UICallbacks:
         """
         Load data from database and display in table with current filter.
         This is optimized to only reload from DB when explicitly refreshed.
+        Reloads run on a worker thread, so the page renders immediately and
+        the table fills in once the first page arrives.
 
         Args:
             event: Panel event (optional)
         """
         # Only load from database if explicitly refreshed or data is empty
         if event is not None or self.data_service.df.empty:
-            self.data_service.load_data()
+            # Coalesce repeated refresh clicks into the load already running
+            if self.ui.table.loading or self._reloaded_recently():
+                return
+            self._start_background_load()
+        else:
+            self._display_data()
 
-        # Apply filter (optimized - no DB reload)
-        filtered_df = self.data_service.get_filtered_data(self.ui.status_filter.value)
-        display_df = self.data_service.get_display_columns(filtered_df)
+    def recheck_images(self, event=None):
+        """
+        Reload data from the database and check every image URL again,
+        ignoring statuses remembered from earlier loads.
+
+        Args:
+            event: Panel event (optional)
+        """
+        if self.ui.table.loading or self._reloaded_recently():
+            return
+        self._start_background_load(recheck=True)
 
-        # Update table
-        self.ui.table.value = display_df
+    def _reloaded_recently(self) -> bool:
+        """Check whether the last reload started less than REFRESH_MIN_INTERVAL ago."""
+        return (
+            self._last_load_started is not None
+            and time.monotonic() - self._last_load_started < REFRESH_MIN_INTERVAL
+        )
+
+    def _display_data(self, selection=None):
+        """
+        Show the loaded data with the current filter applied.
+
+        Args:
+            selection: Table rows to select (defaults to the first row)
+        """
+        # Apply filter (optimized - no DB reload)
+        display_df = self.data_service.get_display_data(self.ui.status_filter.value)
 
         # Handle selection
-        if not self.ui.table.value.empty:
-            self.ui.table.selection = [0]
-            self.update_editor(None)
+        if display_df.empty:
+            selection = []
         else:
-            self.ui.table.selection = []
+            selection = selection or [0]
+
+        # Send table, selection and editor changes as a single document update
+        with pn.io.hold():
+            self._set_table(display_df, selection)
+
+    def _start_background_load(self, selection=None, recheck: bool = False):
+        """
+        Start loading records and streaming statuses on a worker thread.
+
+        Args:
+            selection: Table rows to select once the first page is shown
+            recheck: Check every image again instead of reusing known statuses
+        """
+        self._load_generation += 1
+        self._last_load_started = time.monotonic()
+        self.ui.table.loading = True
+        worker = threading.Thread(
+            target=self._background_load,
+            args=(pn.state.curdoc, self._load_generation, selection, recheck),
+            name="data-loader",
+            daemon=True,
+        )
+        worker.start()
+
+    def _background_load(
+        self, doc, generation: int, selection=None, recheck: bool = False
+    ):
+        """
+        Fetch the first page, stream image statuses into the table, then
+        backfill remaining pages.
+        Runs on a worker thread; all UI changes are scheduled on the session.
+
+        Args:
+            doc: Bokeh document of the session that started the load
+            generation: Load generation, used to drop results of stale loads
+            selection: Table rows to select once the first page is shown
+            recheck: Check every image again instead of reusing known statuses
+        """
+        try:
+            # Notifications are looked up through the session's document
+            try:
+                with set_curdoc(doc):
+                    self.data_service.load_data(recheck)
+            except Exception as e:
+                # Show the emptied table, report the failure once and stop
+                self._run_on_ui(doc, partial(self._show_first_page, None, generation))
+                message = f"Failed to load data: {e}"
+                self._run_on_ui(doc, partial(self._show_load_error, message))
+                return
+            self._run_on_ui(doc, partial(self._show_first_page, selection, generation))
+
+            self._stream_statuses(doc, generation)
+
+            if self.data_service.has_more_data():
+                frames = self.data_service.fetch_remaining_data()
+                self._run_on_ui(doc, partial(self._append_records, frames, generation))
+                self._stream_statuses(doc, generation)
+
+            # Rows that just got a status may now match the active filter
+            if self.ui.status_filter.value != "All":
+                self._run_on_ui(doc, partial(self._refresh_table, generation))
+        except TimeoutError:
+            # The session was closed while loading; nothing left to update
+            return
+        except Exception as e:
+            message = f"Failed to load data: {e}"
+            self._run_on_ui(doc, partial(self._show_load_error, message))
+
+    def _show_first_page(self, selection, generation: int):
+        """Display the first loaded page and hide the loading indicator."""
+        if generation != self._load_generation:
+            return
+
+        self.ui.table.loading = False
+        self._display_data(selection)
+
+    def _show_load_error(self, message: str):
+        """Hide the loading indicator and report a failed load."""
+        self.ui.table.loading = False
+        pn.state.notifications.error(message)
+
+    def _stream_statuses(self, doc, generation: int, labels=None):
+        """Check pending statuses and push each finished batch to the table."""
+        for statuses in self.data_service.iter_status_results(labels=labels):
+            if generation != self._load_generation:
+                return
+            self._run_on_ui(doc, partial(self._apply_statuses, statuses, generation))
+
+    def _run_on_ui(self, doc, callback):
+        """
+        Run a callback on the session's event loop and wait for it to finish.
+
+        Args:
+            doc: Bokeh document of the session
+            callback: Callable performing the UI update
+
+        Returns:
+            The callback's return value
+        """
+        done = Future()
+
+        def _callback():
+            try:
+                done.set_result(callback())
+            except Exception as e:
+                done.set_exception(e)
+
+        with set_curdoc(doc):
+            pn.state.execute(_callback, schedule=True)
+        return done.result(timeout=UI_UPDATE_TIMEOUT)
+
+    def _apply_statuses(self, statuses: dict, generation: int):
+        """Store a batch of statuses and patch the visible table rows."""
+        if generation != self._load_generation:
+            return
+
+        self.data_service.set_statuses(statuses)
+
+        table_index = self.ui.table.value.index
+        visible = [
+            (label, status)
+            for label, status in statuses.items()
+            if label in table_index
+        ]
+        if visible:
+            self.ui.table.patch({"status": visible})
+
+        # Refresh the editor if the selected row just got its status
+        selection = self.ui.table.selection
+        if selection and table_index[selection[0]] in statuses:
             self.update_editor(None)
 
+    def _append_records(self, frames: list, generation: int):
+        """Add backfilled records to the state and refresh the table."""
+        if generation != self._load_generation:
+            return
+
+        self.data_service.append_records(frames)
+        self._refresh_table(generation)
+
+    def _refresh_table(self, generation: int):
+        """Re-apply the current filter while keeping the selection."""
+        if generation != self._load_generation:
+            return
+
+        selected_id = None
+        if self.ui.table.selection:
+            selected_row = self.ui.table.value.iloc[self.ui.table.selection[0]]
+            selected_id = selected_row[self.id_column]
+
+        display_df = self.data_service.get_display_data(self.ui.status_filter.value)
+
+        # Restore the selection by record ID, since filtered rows may shift
+        selection = None
+        if selected_id is not None:
+            positions = (display_df[self.id_column] == selected_id).to_numpy()
+            selection = positions.nonzero()[0][:1].tolist()
+
+        with pn.io.hold():
+            self._set_table(display_df, selection)
+
+    def _set_table(self, value: pd.DataFrame, selection=None):
+        """
+        Replace the table data (and optionally its selection), then update
+        the editor once.
+        Setting the value can already change the selection (the table
+        remaps it by index), so selection events are ignored until both
+        changes are made.
+
+        Args:
+            value: DataFrame to display
+            selection: Table rows to select (keeps the current one if None)
+        """
+        self._updating_table = True
+        try:
+            self.ui.table.value = value
+            if selection is not None:
+                self.ui.table.selection = selection
+        finally:
+            self._updating_table = False
+
+        self.update_editor(None)
+
     def filter_data(self, event):
         """
         Filter displayed data without reloading from database.
@@ -86,19 +334,42 @@ class UICallbacks:
         Args:
             event: Panel event from filter change
         """
-        filtered_df = self.data_service.get_filtered_data(self.ui.status_filter.value)
-        display_df = self.data_service.get_display_columns(filtered_df)
+        # Update table and reset selection to first row if available
+        self._display_data()
 
-        # Update table
-        self.ui.table.value = display_df
+    def check_visible_page(self, event):
+        """
+        Check the pending statuses on the shown table page right away,
+        instead of waiting for the background load to reach those rows.
 
-        # Reset selection to first row if available
-        if not self.ui.table.value.empty:
-            self.ui.table.selection = [0]
-            self.update_editor(None)
-        else:
-            self.ui.table.selection = []
-            self.update_editor(None)
+        Args:
+            event: Panel event from the table page change
+        """
+        table = self.ui.table
+        start = (table.page - 1) * table.page_size
+        visible = table.value.iloc[start : start + table.page_size]
+        if visible.empty:
+            return
+
+        labels = visible.index[visible["status"].isna()]
+        if labels.empty:
+            return
+
+        worker = threading.Thread(
+            target=self._stream_page_statuses,
+            args=(pn.state.curdoc, self._load_generation, labels),
+            name="status-checker",
+            daemon=True,
+        )
+        worker.start()
+
+    def _stream_page_statuses(self, doc, generation: int, labels: pd.Index):
+        """Check the statuses of one table page on a worker thread."""
+        try:
+            self._stream_statuses(doc, generation, labels)
+        except TimeoutError:
+            # The session was closed while checking; nothing left to update
+            return
 
     def update_editor(self, event):
         """
@@ -107,6 +378,10 @@ class UICallbacks:
         Args:
             event: Panel event from table selection
         """
+        # _set_table() updates the editor once both changes are made
+        if self._updating_table:
+            return
+
         if not self.ui.table.selection:
             self.ui.selected_record_info.object = (
                 f"Select a {ENTITY_LABEL.lower()} to edit."
@@ -116,46 +391,40 @@ class UICallbacks:
             return
 
         idx = self.ui.table.selection[0]
-        row = self.ui.table.value.iloc[idx]
+        record_id = self.ui.table.value[self.id_column].iat[idx]
 
-        # Get full row data from data service
-        record_id = row[self.id_column]
-        full_row = self.data_service.get_record_by_id(record_id)
+        # Full record as a plain dict; missing values are None
+        record = self.data_service.get_record_dict(record_id)
 
         # Update image preview
-        img_url = full_row.get(self.image_url_column, None)
-        status = full_row.get("status")
+        info_values = self._info_getter(record)
+        img_url = info_values[2]
+        status = record["status"]
 
         if img_url and status:
-            self.ui.current_image_preview.object = img_url
+            # Prefer the small thumbnail so the preview skips the full-size image
+            thumbnail_url = (
+                record.get(self.thumbnail_url_column)
+                if self.thumbnail_url_column
+                else None
+            )
+            self.ui.current_image_preview.object = thumbnail_url or img_url
         else:
             self.ui.current_image_preview.object = None
 
-        # Build info display dynamically
-        id_label = (
-            self.id_column.upper()
-            if len(self.id_column) <= 3
-            else self.id_column.replace("_", " ").title()
-        )
-        title_label = self.title_column.replace("_", " ").title()
-        image_url_label = self.image_url_column.replace("_", " ").title()
-
-        status_text = "OK" if status else "Error/Missing"
+        if status is None:
+            status_text = "Checking..."
+        else:
+            status_text = "OK" if status else "Error/Missing"
 
-        # Build info with proper line breaks
+        # Build info with proper line breaks (including additional columns)
         info_lines = [
-            f"**{id_label}:** {full_row.get(self.id_column, 'N/A')}",
-            f"**{title_label}:** {full_row.get(self.title_column, 'N/A')}",
-            f"**Current {image_url_label}:** {full_row.get(self.image_url_column, 'None')}",
+            INFO_LINE_TEMPLATE.format(label=label, value=value)
+            for label, value in zip(self._info_labels, info_values)
         ]
 
-        # Add additional columns if configured
-        for col in self.additional_columns:
-            col_label = col.replace("_", " ").title()
-            info_lines.append(f"**{col_label}:** {full_row.get(col, 'None')}")
-
         # Add status
-        info_lines.append(f"**Status:** {status_text}")
+        info_lines.append(INFO_LINE_TEMPLATE.format(label="Status", value=status_text))
 
         # Join with double spaces and newlines for proper markdown formatting
         info = "  \n".join(info_lines)
@@ -168,6 +437,8 @@ class UICallbacks:
     def handle_upload(self, event):
         """
         Handle image upload (file or URL).
+        The upload runs on a worker thread; the record is marked as pending
+        right away and patched in place once the upload finishes.
 
         Args:
             event: Panel event from upload button
@@ -175,39 +446,42 @@ class UICallbacks:
         if not self.ui.table.selection:
             return
 
-        self.ui.update_btn.loading = True
+        # Get selected record info
+        idx = self.ui.table.selection[0]
+        row = self.ui.table.value.iloc[idx]
+        record_id = row[self.id_column]
+        record_title = row[self.title_column]
 
+        # Validate inputs before starting the upload
         try:
-            # Get selected record info
-            idx = self.ui.table.selection[0]
-            row = self.ui.table.value.iloc[idx]
-            record_id = row[self.id_column]
-            record_title = row[self.title_column]
-
-            # Process upload based on type
             if self.ui.upload_type.value == "Upload File":
-                self._handle_file_upload(record_id, record_title)
+                upload = self._handle_file_upload(record_id, record_title)
             else:
-                self._handle_url_upload(record_id, record_title)
+                upload = self._handle_url_upload(record_id, record_title)
+        except ValueError as e:
+            pn.state.notifications.error(f"Error updating image: {e}")
+            return
 
-            # Success notification
-            pn.state.notifications.success("Image updated successfully!")
+        self.ui.update_btn.loading = True
 
-            # Clear inputs and refresh
-            self._clear_inputs()
-            self._refresh_after_upload()
+        # Optimistically mark the record as pending while it uploads
+        previous = self._patch_record(record_id, {"status": pd.NA})
 
-        except Exception as e:
-            pn.state.notifications.error(f"Error updating image: {e}")
-        finally:
-            self.ui.update_btn.loading = False
+        worker = threading.Thread(
+            target=self._background_upload,
+            args=(pn.state.curdoc, record_id, upload, previous),
+            name="image-uploader",
+            daemon=True,
+        )
+        worker.start()
 
     def _handle_file_upload(self, record_id: int, record_title: str):
-        """Handle file upload."""
+        """Validate the file input and return the upload task."""
         if self.ui.file_input.value is None:
             raise ValueError("Please select a file.")
 
-        self.image_service.process_file_upload(
+        return partial(
+            self.image_service.process_file_upload,
             record_id,
             record_title,
             self.ui.file_input.value,
@@ -215,14 +489,99 @@ class UICallbacks:
         )
 
     def _handle_url_upload(self, record_id: int, record_title: str):
-        """Handle URL upload."""
+        """Validate the URL input and return the upload task."""
         if not self.ui.url_input.value:
             raise ValueError("Please enter a URL.")
 
-        self.image_service.process_url_upload(
-            record_id, record_title, self.ui.url_input.value
+        return partial(
+            self.image_service.process_url_upload,
+            record_id,
+            record_title,
+            self.ui.url_input.value,
         )
 
+    def _background_upload(self, doc, record_id: int, upload, previous: dict):
+        """
+        Run an upload task on a worker thread and report back to the session.
+
+        Args:
+            doc: Bokeh document of the session that started the upload
+            record_id: The record being updated
+            upload: Callable performing the upload and database update
+            previous: Record values to restore if the upload fails
+        """
+        try:
+            try:
+                # Notifications are looked up through the session's document
+                with set_curdoc(doc):
+                    values = upload()
+            except Exception as e:
+                message = f"Error updating image: {e}"
+                self._run_on_ui(
+                    doc, partial(self._fail_upload, record_id, previous, message)
+                )
+                return
+
+            self._run_on_ui(doc, partial(self._finish_upload, record_id, values))
+        except TimeoutError:
+            # The session was closed during the upload; nothing left to update
+            return
+
+    def _finish_upload(self, record_id: int, values: dict):
+        """Patch the uploaded record with its new URLs and clear the inputs."""
+        self.ui.update_btn.loading = False
+
+        # The image was just stored, so its URL is known to work
+        self._patch_record(record_id, {**values, "status": True})
+        pn.state.notifications.success("Image updated successfully!")
+        self._clear_inputs()
+
+        # The record may no longer match the active filter
+        if self.ui.status_filter.value != "All":
+            self._refresh_table(self._load_generation)
+
+    def _fail_upload(self, record_id: int, previous: dict, message: str):
+        """Restore the record's previous values and report the error."""
+        self.ui.update_btn.loading = False
+        self._patch_record(record_id, previous)
+        pn.state.notifications.error(message)
+
+    def _patch_record(self, record_id: int, values: dict) -> dict:
+        """
+        Update one record in the state and patch its row in the table.
+
+        Args:
+            record_id: The record to update
+            values: Dict mapping column names to new values
+
+        Returns:
+            Dict with the previous values, or an empty dict if the record
+            is no longer loaded
+        """
+        if not self.data_service.has_record(record_id):
+            return {}
+
+        previous = self.data_service.update_record(record_id, values)
+        label = self.data_service.get_record_label(record_id)
+
+        # Only patch the columns shown in the table, if the row is visible
+        table_value = self.ui.table.value
+        if label in table_value.index:
+            self.ui.table.patch(
+                {
+                    col: [(label, value)]
+                    for col, value in values.items()
+                    if col in table_value.columns
+                }
+            )
+
+            # Refresh the editor if the patched record is selected
+            selection = self.ui.table.selection
+            if selection and table_value.index[selection[0]] == label:
+                self.update_editor(None)
+
+        return previous
+
     def _clear_inputs(self):
         """Clear upload inputs after successful upload."""
         # Replace file input to force clear
@@ -234,16 +593,6 @@ class UICallbacks:
         # Clear URL input
         self.ui.url_input.value = ""
 
-    def _refresh_after_upload(self):
-        """Refresh data after upload maintaining selection."""
-        current_selection = self.ui.table.selection
-        # Force reload by passing a dummy event (event is not None triggers reload)
-        self.load_and_display_data(event=True)
-
-        # Restore selection if possible
-        if current_selection:
-            self.ui.table.selection = current_selection
-
     def toggle_inputs(self, event):
         """
         Toggle visibility of file/URL inputs based on upload type.
@@ -266,12 +615,18 @@ class UICallbacks:
         # Refresh button triggers full data reload
         self.ui.refresh_btn.on_click(self.load_and_display_data)
 
+        # Recheck button reloads and checks every image URL again
+        self.ui.recheck_btn.on_click(self.recheck_images)
+
         # Filter uses optimized filtering without DB reload
         self.ui.status_filter.param.watch(self.filter_data, "value")
 
         # Table selection updates editor
         self.ui.table.param.watch(self.update_editor, "selection")
 
+        # Paging checks the statuses of the shown rows first
+        self.ui.table.param.watch(self.check_visible_page, "page")
+
         # Upload button
         self.ui.update_btn.on_click(self.handle_upload)
 
@@ -24,6 +24,48 @@ from constants.config import (
 from ui.styles import FILTER_STYLESHEET
 
 
+def _column_label(column: str) -> str:
+    """
+    Turn a column name into a table header label.
+
+    Args:
+        column: Database column name
+
+    Returns:
+        Upper-cased short names (e.g., "ID"), title-cased names otherwise
+    """
+    if column == ID_COLUMN and len(column) <= 3:
+        return column.upper()
+    return column.replace("_", " ").title()
+
+
+# Table column setup; static, so it is built once and shared by all sessions
+_TABLE_CONFIGURATION = {
+    "columns": [
+        {"title": _column_label(ID_COLUMN), "field": ID_COLUMN, "width": 60},
+        {"title": _column_label(TITLE_COLUMN), "field": TITLE_COLUMN, "width": 200},
+        {
+            "title": _column_label(IMAGE_URL_COLUMN),
+            "field": IMAGE_URL_COLUMN,
+            "formatter": "link",
+            "width": 450,
+        },
+        {
+            "title": "Status",
+            "field": "status",
+            "width": 100,
+            "formatter": "tickCross",
+            "formatterParams": {
+                "allowEmpty": True,
+                "allowTruthy": True,
+                "tickElement": "<span style='color:green; font-weight:bold;'>OK</span>",
+                "crossElement": "<span style='color:red; font-weight:bold;'>Error</span>",
+            },
+        },
+    ]
+}
+
+
 class UIComponents:
     """Container for all UI components with centralized creation."""
 
@@ -43,6 +85,9 @@ class UIComponents:
 
         # Control components
         self.refresh_btn = pn.widgets.Button(name="Refresh Data", button_type="primary")
+        self.recheck_btn = pn.widgets.Button(
+            name="Recheck Images", button_type="default"
+        )
 
         self.status_filter = pn.widgets.RadioButtonGroup(
             name="Status Filter",
@@ -82,15 +127,6 @@ class UIComponents:
         Returns:
             Configured Tabulator widget
         """
-        # Get proper column labels
-        id_label = (
-            self.id_column.upper()
-            if len(self.id_column) <= 3
-            else self.id_column.replace("_", " ").title()
-        )
-        title_label = self.title_column.replace("_", " ").title()
-        image_url_label = self.image_url_column.replace("_", " ").title()
-
         return pn.widgets.Tabulator(
             pd.DataFrame(),
             selection=[0] if not pd.DataFrame().empty else [],
@@ -99,30 +135,7 @@ class UIComponents:
             page_size=TABLE_PAGE_SIZE,
             selectable=1,
             show_index=False,
-            configuration={
-                "columns": [
-                    {"title": id_label, "field": self.id_column, "width": 60},
-                    {"title": title_label, "field": self.title_column, "width": 200},
-                    {
-                        "title": image_url_label,
-                        "field": self.image_url_column,
-                        "formatter": "link",
-                        "width": 450,
-                    },
-                    {
-                        "title": "Status",
-                        "field": "status",
-                        "width": 100,
-                        "formatter": "tickCross",
-                        "formatterParams": {
-                            "allowEmpty": True,
-                            "allowTruthy": True,
-                            "tickElement": "<span style='color:green; font-weight:bold;'>OK</span>",
-                            "crossElement": "<span style='color:red; font-weight:bold;'>Error</span>",
-                        },
-                    },
-                ]
-            },
+            configuration=_TABLE_CONFIGURATION,
         )
 
     def create_sidebar(self) -> pn.Column:
@@ -134,7 +147,7 @@ class UIComponents:
         """
         return pn.Column(
             "### Actions",
-            self.refresh_btn,
+            pn.Row(self.refresh_btn, self.recheck_btn),
             "### Editor",
             self.selected_record_info,
             self.current_image_preview,
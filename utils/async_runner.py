@@ -0,0 +1,60 @@
+"""
+Async runner utilities.
+Runs coroutines on a dedicated background event loop.
+
+Panel callbacks already execute inside the server's event loop, so
+`asyncio.run` cannot be used there. Submitting work to a long-lived loop
+on its own thread lets synchronous code await coroutines safely.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Coroutine, Optional
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """
+    Get the background event loop, starting it on first use.
+
+    Returns:
+        Running event loop owned by the background thread
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            thread = threading.Thread(
+                target=_loop.run_forever, name="async-runner", daemon=True
+            )
+            thread.start()
+    return _loop
+
+
+def submit(coro: Coroutine) -> Future:
+    """
+    Schedule a coroutine on the background loop without waiting for it.
+
+    Args:
+        coro: Coroutine to execute
+
+    Returns:
+        Future resolving to the coroutine's return value
+    """
+    return asyncio.run_coroutine_threadsafe(coro, get_event_loop())
+
+
+def run_sync(coro: Coroutine) -> Any:
+    """
+    Run a coroutine on the background loop and wait for its result.
+
+    Args:
+        coro: Coroutine to execute
+
+    Returns:
+        The coroutine's return value
+    """
+    return submit(coro).result()
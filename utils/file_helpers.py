@@ -3,8 +3,29 @@ File handling utilities.
 Provides helpers for file operations and sanitization.
 """
 
-import os
-from urllib.parse import urlparse
+import re
+import string
+from functools import lru_cache
+from types import MappingProxyType
+
+# MIME types of the supported image extensions (read-only)
+CONTENT_TYPE_MAP = MappingProxyType(
+    {
+        ".jpg": "image/jpeg",
+        ".jpeg": "image/jpeg",
+        ".png": "image/png",
+        ".webp": "image/webp",
+    }
+)
+
+# Characters that are not letters, digits, underscores, hyphens or spaces
+_UNSAFE_FILENAME_CHARS = re.compile(r"[^\w\- ]+")
+
+# Translation table deleting the same characters from ASCII-only text
+_SAFE_ASCII_CHARS = set(string.ascii_letters + string.digits + "_- ")
+_UNSAFE_ASCII_TABLE = str.maketrans(
+    {chr(cp): None for cp in range(128) if chr(cp) not in _SAFE_ASCII_CHARS}
+)
 
 
 def sanitize_filename(text: str) -> str:
@@ -17,17 +38,37 @@ def sanitize_filename(text: str) -> str:
     Returns:
         Sanitized string safe for filenames
     """
-    # Handle None or empty text
-    if not text or text is None:
+    # Handle None, NA or empty text
+    if not isinstance(text, str) or not text:
         return "untitled"
 
-    safe_text = "".join([c for c in text if c.isalnum() or c in (" ", "-", "_")])
+    # ASCII titles (the common case) use a single translate pass
+    if text.isascii():
+        safe_text = text.translate(_UNSAFE_ASCII_TABLE)
+    else:
+        safe_text = _UNSAFE_FILENAME_CHARS.sub("", text)
     sanitized = safe_text.strip().replace(" ", "_")
 
     # Return default if result is empty after sanitization
     return sanitized if sanitized else "untitled"
 
 
+def _get_extension(path: str) -> str:
+    """
+    Get the lowercase extension of the last component of a path.
+
+    Args:
+        path: A file name, path or bare extension (e.g., '.png')
+
+    Returns:
+        Extension including the dot, or an empty string if there is none
+    """
+    _, dot, ext = path.rpartition(".")
+    if not dot or "/" in ext or "\\" in ext:
+        return ""
+    return "." + ext.lower()
+
+
 def create_record_filename(
     record_id: int, title: str, extension: str, max_length: int = 50
 ) -> str:
@@ -54,6 +95,7 @@ def create_record_filename(
     return f"{record_id}_{safe_title}{extension}"
 
 
+@lru_cache(maxsize=1024)
 def get_extension_from_url(url: str, default: str = ".jpg") -> str:
     """
     Extract file extension from a URL.
@@ -65,8 +107,13 @@ def get_extension_from_url(url: str, default: str = ".jpg") -> str:
     Returns:
         File extension including the dot (e.g., '.jpg')
     """
-    path = urlparse(url).path
-    ext = os.path.splitext(path)[1].lower()
+    # Keep only the path: drop the fragment, query and scheme://host parts
+    path = url.split("#", 1)[0].split("?", 1)[0]
+    host_start = path.find("//")
+    if host_start != -1 and "/" not in path[:host_start]:
+        path = path[host_start + 2 :].partition("/")[2]
+
+    ext = _get_extension(path)
     return ext if ext else default
 
 
@@ -81,18 +128,5 @@ def get_content_type(filename: str, default: str = "image/jpeg") -> str:
     Returns:
         MIME type string (e.g., 'image/jpeg')
     """
-    # If input is already just an extension (starts with dot), use it directly
-    # Otherwise extract extension from filename
-    if filename.startswith(".") and "/" not in filename and "\\" not in filename:
-        ext = filename.lower()
-    else:
-        ext = os.path.splitext(filename)[1].lower()
-
-    content_type_map = {
-        ".jpg": "image/jpeg",
-        ".jpeg": "image/jpeg",
-        ".png": "image/png",
-        ".webp": "image/webp",
-    }
-
-    return content_type_map.get(ext, default)
+    # A bare extension (e.g., '.png') is its own extension
+    return CONTENT_TYPE_MAP.get(_get_extension(filename), default)
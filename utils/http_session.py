@@ -0,0 +1,40 @@
+"""
+HTTP session utilities.
+Provides a pooled requests session so repeated calls reuse TCP/TLS connections.
+"""
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from constants.config import HTTP_POOL_CONNECTIONS, HTTP_POOL_MAXSIZE
+
+
+def create_session(
+    pool_connections: int = HTTP_POOL_CONNECTIONS,
+    pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    max_retries=0,
+) -> requests.Session:
+    """
+    Create a requests session with a keep-alive connection pool.
+
+    Args:
+        pool_connections: Number of per-host connection pools to cache
+        pool_maxsize: Maximum number of connections kept alive per host
+        max_retries: Retry count or urllib3 Retry policy for the adapter
+
+    Returns:
+        Configured requests Session
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=max_retries,
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+# Shared session (safe to use from multiple worker threads)
+http_session = create_session()
@@ -1,20 +1,59 @@
 """
 Image optimization utility module.
 Handles image compression, resizing, and format conversion for optimized storage.
+
+JPEG inputs are decoded with libjpeg-turbo through simplejpeg when it is
+installed (pip install simplejpeg), and with Pillow otherwise. Decoded JPEGs
+are downscaled with OpenCV's SIMD area filter when it is installed
+(pip install opencv-python-headless).
 """
 
+import hashlib
+import math
 from io import BytesIO
-from typing import Tuple
+from typing import Optional, Tuple
 
-from PIL import Image, ImageOps
+import numpy as np
+from PIL import ExifTags, Image, ImageOps
 
 from constants.config import (
     IMAGE_MAX_DIMENSION,
+    IMAGE_PROGRESSIVE,
     IMAGE_QUALITY,
+    IMAGE_RESAMPLE_FILTER,
+    IMAGE_SUBSAMPLING,
+    PREVIEW_FORMAT,
     THUMBNAIL_MAX_DIMENSION,
     THUMBNAIL_QUALITY,
 )
 
+# Resize filter for downscales left after a reduced-scale decode
+_RESAMPLE_FILTER = Image.Resampling[IMAGE_RESAMPLE_FILTER.upper()]
+
+# Optional SIMD JPEG codec (libjpeg-turbo)
+try:
+    import simplejpeg
+except ImportError:
+    simplejpeg = None
+
+# Optional SIMD resizer for decoded JPEG pixels
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+# Pillow subsampling values mapped to simplejpeg's names
+_SIMPLEJPEG_SUBSAMPLING = {0: "444", 1: "422", 2: "420"}
+
+# Pillow JPEG settings; progressive JPEGs always get optimized Huffman
+# tables, so the extra optimize pass is only needed for baseline JPEGs
+_JPEG_SAVE_KWARGS = {
+    "format": "JPEG",
+    "progressive": IMAGE_PROGRESSIVE,
+    "optimize": not IMAGE_PROGRESSIVE,
+    "subsampling": IMAGE_SUBSAMPLING,
+}
+
 
 class ImageOptimizer:
     """Service for optimizing images before upload."""
@@ -24,9 +63,9 @@ class ImageOptimizer:
         image_data: bytes,
         max_dimension: int = IMAGE_MAX_DIMENSION,
         quality: int = IMAGE_QUALITY,
-    ) -> Tuple[bytes, str]:
+    ) -> bytes:
         """
-        Optimize an image by resizing and compressing it.
+        Optimize an image by resizing and compressing it to JPEG.
 
         Args:
             image_data: Original image data as bytes
@@ -34,41 +73,23 @@ class ImageOptimizer:
             quality: JPEG quality (1-95, higher = better quality but larger file)
 
         Returns:
-            Tuple of (optimized_image_bytes, format)
+            Optimized JPEG image bytes
         """
-        # Open image
-        img = Image.open(BytesIO(image_data))
-
-        # Convert RGBA to RGB if necessary (for JPEG compatibility)
-        if img.mode in ("RGBA", "LA", "P"):
-            # Create a white background
-            background = Image.new("RGB", img.size, (255, 255, 255))
-            if img.mode == "P":
-                img = img.convert("RGBA")
-            background.paste(
-                img, mask=img.split()[-1] if img.mode in ("RGBA", "LA") else None
-            )
-            img = background
-
-        # Apply EXIF orientation if present
-        img = ImageOps.exif_transpose(img)
+        img = ImageOptimizer._load_image(image_data, max_dimension)
 
         # Resize if image is larger than max_dimension
         if max(img.size) > max_dimension:
-            img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+            img.thumbnail((max_dimension, max_dimension), _RESAMPLE_FILTER)
 
         # Save optimized image to bytes
-        output = BytesIO()
-        img.save(output, format="JPEG", quality=quality, optimize=True)
-        output.seek(0)
-
-        return output.getvalue(), "jpeg"
+        return ImageOptimizer._encode_jpeg(img, quality)
 
     @staticmethod
     def create_thumbnail(
         image_data: bytes,
         max_dimension: int = THUMBNAIL_MAX_DIMENSION,
         quality: int = THUMBNAIL_QUALITY,
+        image_format: str = PREVIEW_FORMAT,
     ) -> bytes:
         """
         Create a thumbnail version of an image.
@@ -76,37 +97,212 @@ class ImageOptimizer:
         Args:
             image_data: Original image data as bytes
             max_dimension: Maximum width or height for thumbnail
-            quality: JPEG quality for thumbnail
+            quality: Encoder quality for thumbnail
+            image_format: Thumbnail format ("WEBP" or "JPEG")
 
         Returns:
             Thumbnail image bytes
         """
-        # Open image
+        img = ImageOptimizer._load_image(image_data, max_dimension)
+
+        # Create thumbnail
+        img.thumbnail((max_dimension, max_dimension), _RESAMPLE_FILTER)
+
+        # Save to bytes
+        return ImageOptimizer._encode_preview(img, quality, image_format)
+
+    @staticmethod
+    def optimize_and_thumbnail(
+        image_data: bytes,
+        max_dimension: int = IMAGE_MAX_DIMENSION,
+        quality: int = IMAGE_QUALITY,
+        thumbnail_max_dimension: int = THUMBNAIL_MAX_DIMENSION,
+        thumbnail_quality: int = THUMBNAIL_QUALITY,
+        thumbnail_format: str = PREVIEW_FORMAT,
+    ) -> Tuple[bytes, bytes]:
+        """
+        Optimize an image and create its thumbnail from a single decode.
+        The thumbnail is scaled down from the resized image, so the original
+        is only decoded once.
+
+        Args:
+            image_data: Original image data as bytes
+            max_dimension: Maximum width or height of the optimized image
+            quality: JPEG quality of the optimized image
+            thumbnail_max_dimension: Maximum width or height of the thumbnail
+            thumbnail_quality: Encoder quality of the thumbnail
+            thumbnail_format: Thumbnail format ("WEBP" or "JPEG")
+
+        Returns:
+            Tuple of (optimized_image_bytes, thumbnail_bytes)
+        """
+        img = ImageOptimizer._load_image(image_data, max_dimension)
+
+        # Resize and save the optimized image
+        if max(img.size) > max_dimension:
+            img.thumbnail((max_dimension, max_dimension), _RESAMPLE_FILTER)
+        optimized_data = ImageOptimizer._encode_jpeg(img, quality)
+
+        # Scale the same pixels down to the thumbnail
+        img.thumbnail(
+            (thumbnail_max_dimension, thumbnail_max_dimension),
+            _RESAMPLE_FILTER,
+        )
+        thumbnail_data = ImageOptimizer._encode_preview(
+            img, thumbnail_quality, thumbnail_format
+        )
+        return optimized_data, thumbnail_data
+
+    @staticmethod
+    def _load_image(image_data: bytes, max_dimension: int) -> Image.Image:
+        """
+        Decode an image into an upright RGB (or grayscale) image.
+        Transparent images are flattened onto a white background.
+
+        Args:
+            image_data: Original image data as bytes
+            max_dimension: Target maximum width or height, used to decode
+                large JPEGs at a reduced scale
+
+        Returns:
+            Decoded image, at least max_dimension on its longer side unless
+            the original is smaller
+        """
+        # Open image (reads the header only)
         img = Image.open(BytesIO(image_data))
 
-        # Convert RGBA to RGB if necessary
+        # Decode JPEGs with libjpeg-turbo when possible
+        turbo_img = ImageOptimizer._decode_jpeg_turbo(image_data, img, max_dimension)
+        if turbo_img is not None:
+            return turbo_img
+
+        # Let libjpeg decode large JPEGs at a reduced scale (no-op for other
+        # formats); draft() keeps both sides at least the requested size
+        if max(img.size) > max_dimension:
+            ratio = max_dimension / max(img.size)
+            img.draft(
+                "RGB", (math.ceil(img.width * ratio), math.ceil(img.height * ratio))
+            )
+
+        # Convert RGBA to RGB if necessary (for JPEG compatibility)
         if img.mode in ("RGBA", "LA", "P"):
+            # Create a white background
             background = Image.new("RGB", img.size, (255, 255, 255))
             if img.mode == "P":
                 img = img.convert("RGBA")
-            background.paste(
-                img, mask=img.split()[-1] if img.mode in ("RGBA", "LA") else None
-            )
+            # An RGBA/LA mask is read through its alpha band, without split()
+            background.paste(img, mask=img if img.mode in ("RGBA", "LA") else None)
             img = background
 
-        # Apply EXIF orientation
-        img = ImageOps.exif_transpose(img)
+        # Apply EXIF orientation if present
+        return ImageOps.exif_transpose(img)
 
-        # Create thumbnail
-        img.thumbnail((max_dimension, max_dimension), Image.Resampling.LANCZOS)
+    @staticmethod
+    def _decode_jpeg_turbo(
+        image_data: bytes, img: Image.Image, max_dimension: int
+    ) -> Optional[Image.Image]:
+        """
+        Decode a JPEG with libjpeg-turbo, letting it scale the image down
+        towards max_dimension while decoding. With OpenCV installed, the
+        rest of the downscale is done on the pixel array with INTER_AREA.
+
+        Args:
+            image_data: Original image data as bytes
+            img: The same image opened lazily with Pillow (header only)
+            max_dimension: Target maximum width or height in pixels
+
+        Returns:
+            Decoded RGB image, or None if Pillow should decode the image
+            (simplejpeg missing, not an RGB/grayscale JPEG, or EXIF-rotated)
+        """
+        if simplejpeg is None or not image_data.startswith(b"\xff\xd8"):
+            return None
+        if img.mode not in ("RGB", "L"):
+            return None
+        if img.getexif().get(ExifTags.Base.Orientation, 1) != 1:
+            return None
+
+        # Keep the longer side at least max_dimension so thumbnail() does the rest
+        width, height = img.size
+        scale = {}
+        if max(width, height) > max_dimension:
+            scale = (
+                {"min_width": max_dimension}
+                if width >= height
+                else {"min_height": max_dimension}
+            )
+
+        pixels = simplejpeg.decode_jpeg(image_data, colorspace="RGB", **scale)
+
+        # Finish the downscale with OpenCV's area filter
+        height, width = pixels.shape[:2]
+        if cv2 is not None and max(width, height) > max_dimension:
+            ratio = max_dimension / max(width, height)
+            size = (max(1, round(width * ratio)), max(1, round(height * ratio)))
+            pixels = cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+
+        return Image.fromarray(pixels)
+
+    @staticmethod
+    def _encode_jpeg(img: Image.Image, quality: int) -> bytes:
+        """
+        Encode an image as JPEG using the configured JPEG settings.
+        simplejpeg cannot write progressive JPEGs, so it is only used when
+        IMAGE_PROGRESSIVE is disabled.
+
+        Args:
+            img: Image to encode
+            quality: JPEG quality (1-95)
+
+        Returns:
+            JPEG image bytes
+        """
+        if simplejpeg is not None and not IMAGE_PROGRESSIVE and img.mode == "RGB":
+            return simplejpeg.encode_jpeg(
+                np.asarray(img),
+                quality=quality,
+                colorspace="RGB",
+                colorsubsampling=_SIMPLEJPEG_SUBSAMPLING[IMAGE_SUBSAMPLING],
+            )
 
-        # Save to bytes
         output = BytesIO()
-        img.save(output, format="JPEG", quality=quality, optimize=True)
-        output.seek(0)
+        img.save(output, quality=quality, **_JPEG_SAVE_KWARGS)
+        return output.getvalue()
 
+    @staticmethod
+    def _encode_preview(img: Image.Image, quality: int, image_format: str) -> bytes:
+        """
+        Encode a preview image (thumbnail) in the requested format.
+        WebP is about a third smaller than JPEG at the same visual quality.
+
+        Args:
+            img: Image to encode
+            quality: Encoder quality (1-100)
+            image_format: "WEBP" or "JPEG"
+
+        Returns:
+            Encoded image bytes
+        """
+        if image_format.upper() != "WEBP":
+            return ImageOptimizer._encode_jpeg(img, quality)
+
+        output = BytesIO()
+        img.save(output, format="WEBP", quality=quality, method=4)
         return output.getvalue()
 
+    @staticmethod
+    def content_hash(image_data: bytes) -> str:
+        """
+        Get a fingerprint of image data for recognizing identical files.
+
+        Args:
+            image_data: Image data as bytes
+
+        Returns:
+            128-bit BLAKE2b digest as a hex string
+        """
+        return hashlib.blake2b(image_data, digest_size=16).hexdigest()
+
     @staticmethod
     def get_image_info(image_data: bytes) -> dict:
         """
@@ -0,0 +1,59 @@
+"""
+Image probing utilities.
+Reads image dimensions from file headers without decoding any pixels.
+"""
+
+import struct
+from typing import Optional, Tuple
+
+# Start-of-frame markers (SOF0-SOF15 except DHT, JPG and DAC)
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+
+# Markers that stand alone without a length field (TEM, RST0-RST7)
+_JPEG_STANDALONE_MARKERS = frozenset([0x01, *range(0xD0, 0xD8)])
+
+# Start-of-scan marker; compressed image data follows it
+_JPEG_SOS_MARKER = 0xDA
+
+
+def probe_jpeg(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Get the dimensions of a JPEG from its start-of-frame header.
+    Walks the marker segments (skipping EXIF and other metadata by their
+    length) until the frame header is found.
+
+    Args:
+        data: Image data as bytes
+
+    Returns:
+        Tuple of (width, height), or None if data is not a readable JPEG
+    """
+    if not data.startswith(b"\xff\xd8"):
+        return None
+
+    position = 2
+    while position + 9 <= len(data):
+        if data[position] != 0xFF:
+            return None
+
+        marker = data[position + 1]
+
+        # Skip fill bytes and standalone markers
+        if marker == 0xFF:
+            position += 1
+            continue
+        if marker in _JPEG_STANDALONE_MARKERS:
+            position += 2
+            continue
+
+        if marker in _JPEG_SOF_MARKERS:
+            height, width = struct.unpack_from(">HH", data, position + 5)
+            return width, height
+        if marker == _JPEG_SOS_MARKER:
+            return None
+
+        # Jump over the segment (the length includes its own two bytes)
+        (length,) = struct.unpack_from(">H", data, position + 2)
+        position += 2 + length
+
+    return None
@@ -3,12 +3,182 @@ Image validation utilities.
 Handles checking image URL availability and status.
 """
 
-from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import queue
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Iterator, Optional, Sequence, Tuple, Union
 
+import httpx
+import numpy as np
 import pandas as pd
-import requests
 
-from constants.config import IMAGE_CHECK_MAX_WORKERS, IMAGE_CHECK_TIMEOUT
+from constants.config import (
+    IMAGE_CHECK_CONCURRENCY,
+    IMAGE_CHECK_TIMEOUT,
+    IMAGE_STATUS_CACHE_SIZE,
+    IMAGE_STATUS_CACHE_TTL,
+)
+from utils.async_runner import run_sync, submit
+from utils.http_session import http_session
+
+# Absolute http(s) URL with a non-empty host
+_HTTP_URL_RE = re.compile(r"^https?://[^\s/?#]+", re.IGNORECASE)
+
+# Ask for the first byte only (some CDNs reject HEAD but serve ranged GETs)
+_RANGE_HEADERS = {"Range": "bytes=0-0"}
+
+# Status codes of an accessible image (206 answers the range request)
+_OK_STATUS_CODES = frozenset([200, 206])
+
+# Responses with at most this many body bytes are read to the end, so their
+# keep-alive connection goes back to the pool; larger ones (a full image from
+# a server that ignored the range) are closed unread
+_MAX_DRAINED_BODY_BYTES = 1024
+
+# Cached results, least recently used first:
+# url -> (status, etag, last_modified, checked_at)
+_status_cache: OrderedDict = OrderedDict()
+_status_lock = threading.Lock()
+
+# Shared HTTP/2 client, bound to the async runner's event loop on first use
+_async_client: Optional[httpx.AsyncClient] = None
+
+
+def _is_checkable(url) -> bool:
+    """
+    Check whether a URL value is worth a network request.
+    Empty/NaN values and malformed or non-HTTP URLs fail without any I/O.
+
+    Args:
+        url: The image URL value from the table
+
+    Returns:
+        True if the URL is an absolute http(s) URL, False otherwise
+    """
+    if not isinstance(url, str) or not url:
+        return False
+    return _HTTP_URL_RE.match(url) is not None
+
+
+def _checkable_positions(urls: Sequence[str]) -> np.ndarray:
+    """
+    Find the URLs worth a network request in one vectorized pass.
+    Same rules as _is_checkable(), without a Python call per URL.
+
+    Args:
+        urls: Sequence of image URL values
+
+    Returns:
+        Positions of the absolute http(s) URLs in urls
+    """
+    values = pd.Series(np.asarray(urls, dtype=object), dtype=object)
+    mask = values.str.match(_HTTP_URL_RE.pattern, flags=re.IGNORECASE, na=False)
+    return np.flatnonzero(mask.to_numpy(dtype=bool))
+
+
+def _get_fresh_status(url: str) -> Optional[bool]:
+    """
+    Get a cached status if it was checked within the TTL window.
+
+    Args:
+        url: The image URL
+
+    Returns:
+        Cached status, or None if the URL must be re-checked
+    """
+    with _status_lock:
+        entry = _status_cache.get(url)
+        if entry and time.time() - entry[3] < IMAGE_STATUS_CACHE_TTL:
+            _status_cache.move_to_end(url)
+            return entry[0]
+    return None
+
+
+def _get_conditional_headers(url: str) -> dict:
+    """
+    Build conditional request headers from the cached validators.
+
+    Args:
+        url: The image URL
+
+    Returns:
+        Dict with the range header and, if cached, If-None-Match /
+        If-Modified-Since headers
+    """
+    headers = dict(_RANGE_HEADERS)
+    with _status_lock:
+        entry = _status_cache.get(url)
+    if not entry:
+        return headers
+
+    if entry[1]:
+        headers["If-None-Match"] = entry[1]
+    if entry[2]:
+        headers["If-Modified-Since"] = entry[2]
+    return headers
+
+
+def _store_status(url: str, status_code: int, headers) -> bool:
+    """
+    Resolve a response into a status and update the cache.
+
+    Args:
+        url: The image URL
+        status_code: HTTP status code of the response
+        headers: Response headers
+
+    Returns:
+        True if image is accessible, False otherwise
+    """
+    with _status_lock:
+        entry = _status_cache.get(url)
+
+        # 304 Not Modified confirms the cached status
+        if status_code == 304 and entry:
+            status = entry[0]
+            _status_cache[url] = (status, entry[1], entry[2], time.time())
+        else:
+            status = status_code in _OK_STATUS_CODES
+            _status_cache[url] = (
+                status,
+                headers.get("ETag"),
+                headers.get("Last-Modified"),
+                time.time(),
+            )
+        _status_cache.move_to_end(url)
+
+        # Drop the least recently used entry once the cache is full
+        if len(_status_cache) > IMAGE_STATUS_CACHE_SIZE:
+            _status_cache.popitem(last=False)
+    return status
+
+
+def _should_drain(status_code: int, headers) -> bool:
+    """
+    Check whether a response body is small enough to read before closing.
+    Closing an HTTP/1.1 response with unread body bytes drops its connection.
+
+    Args:
+        status_code: HTTP status code of the response
+        headers: Response headers
+
+    Returns:
+        True for ranged (206) and bodiless (304) responses, and for bodies
+        announced as at most _MAX_DRAINED_BODY_BYTES long
+    """
+    if status_code in (206, 304):
+        return True
+    length = headers.get("Content-Length", "")
+    return length.isdigit() and int(length) <= _MAX_DRAINED_BODY_BYTES
+
+
+def clear_status_cache() -> None:
+    """Forget all cached statuses so the next checks go to the network."""
+    with _status_lock:
+        _status_cache.clear()
 
 
 def get_image_status(url: str) -> bool:
@@ -19,28 +189,168 @@ def get_image_status(url: str) -> bool:
         url: The image URL to check
 
     Returns:
-        True if image is accessible (HTTP 200), False otherwise
+        True if image is accessible (HTTP 200/206), False otherwise
     """
-    if not url or pd.isna(url) or url == "":
+    if not _is_checkable(url):
         return False
 
+    cached = _get_fresh_status(url)
+    if cached is not None:
+        return cached
+
     try:
-        response = requests.head(url, timeout=IMAGE_CHECK_TIMEOUT)
-        return response.status_code == 200
+        # Pooled session reuses keep-alive connections across checks; the
+        # body is streamed so a server ignoring the range costs no download
+        with http_session.get(
+            url,
+            headers=_get_conditional_headers(url),
+            timeout=IMAGE_CHECK_TIMEOUT,
+            allow_redirects=False,
+            stream=True,
+        ) as response:
+            if _should_drain(response.status_code, response.headers):
+                response.content  # Read the body to release the connection
+            return _store_status(url, response.status_code, response.headers)
     except Exception:
         return False
 
 
-def check_images_parallel(urls: list) -> list:
+async def _get_image_status_async(
+    client: httpx.AsyncClient, semaphore: asyncio.Semaphore, url: str
+) -> bool:
     """
-    Check multiple image URLs in parallel for better performance.
+    Asynchronously check a single image URL.
 
     Args:
-        urls: List of image URLs to check
+        client: Shared async HTTP client
+        semaphore: Semaphore bounding the number of in-flight requests
+        url: The image URL to check (already known to be checkable)
 
     Returns:
-        List of boolean status results (True=OK, False=Error)
+        True if image is accessible (HTTP 200/206), False otherwise
     """
-    with ThreadPoolExecutor(max_workers=IMAGE_CHECK_MAX_WORKERS) as executor:
-        results = list(executor.map(get_image_status, urls))
+    cached = _get_fresh_status(url)
+    if cached is not None:
+        return cached
+
+    async with semaphore:
+        try:
+            # The body is streamed so a server ignoring the range costs no
+            # download; small bodies are read to release the connection
+            async with client.stream(
+                "GET", url, headers=_get_conditional_headers(url)
+            ) as response:
+                if _should_drain(response.status_code, response.headers):
+                    await response.aread()
+                return _store_status(url, response.status_code, response.headers)
+        except Exception:
+            return False
+
+
+def _get_async_client() -> httpx.AsyncClient:
+    """
+    Get the shared AsyncClient, creating it on first use.
+    Must be called from the async runner's event loop, which owns the
+    client's connections.
+
+    Returns:
+        AsyncClient multiplexing requests over kept-alive HTTP/2 connections
+    """
+    global _async_client
+    if _async_client is None:
+        limits = httpx.Limits(
+            max_connections=IMAGE_CHECK_CONCURRENCY,
+            max_keepalive_connections=IMAGE_CHECK_CONCURRENCY,
+        )
+        _async_client = httpx.AsyncClient(
+            http2=True, limits=limits, timeout=IMAGE_CHECK_TIMEOUT
+        )
+    return _async_client
+
+
+async def check_images_async(
+    urls: Sequence[str], on_result: Optional[Callable[[int, bool], None]] = None
+) -> list:
+    """
+    Check all URLs concurrently over the shared HTTP/2 connection pool.
+    Must be awaited on the async runner's event loop (see utils.async_runner).
+
+    Args:
+        urls: Sequence of image URLs to check
+        on_result: Optional callback invoked with (position, status) as
+            soon as each check completes
+
+    Returns:
+        List of boolean status results in input order
+    """
+    client = _get_async_client()
+    semaphore = asyncio.Semaphore(IMAGE_CHECK_CONCURRENCY)
+    values = np.asarray(urls, dtype=object)
+    results = [False] * len(values)
+
+    # Empty and malformed URLs fail up front, without a task each
+    positions = _checkable_positions(values)
+    if on_result:
+        skipped = np.ones(len(values), dtype=bool)
+        skipped[positions] = False
+        for position in np.flatnonzero(skipped):
+            on_result(int(position), False)
+
+    async def _check(position: int) -> None:
+        status = await _get_image_status_async(client, semaphore, values[position])
+        results[position] = status
+        if on_result:
+            on_result(position, status)
+
+    await asyncio.gather(*(_check(int(position)) for position in positions))
     return results
+
+
+def check_images_parallel(urls: Union[pd.Series, Sequence[str]]) -> pd.Series:
+    """
+    Check multiple image URLs concurrently for better performance.
+    All requests are multiplexed over HTTP/2 on one event loop instead of a
+    thread pool.
+
+    Args:
+        urls: Image URLs to check (Series, list or numpy object array)
+
+    Returns:
+        Boolean Series of status results (True=OK, False=Error), aligned to
+        the index of urls when it is a Series, usable directly as a row mask
+    """
+    index = urls.index if isinstance(urls, pd.Series) else None
+    values = np.asarray(urls, dtype=object)
+
+    # Fill a preallocated array as checks complete instead of building a list
+    statuses = np.zeros(len(values), dtype=bool)
+
+    def _store(position: int, status: bool):
+        statuses[position] = status
+
+    run_sync(check_images_async(values, on_result=_store))
+    return pd.Series(statuses, index=index, dtype=bool)
+
+
+def iter_image_statuses(urls: Sequence[str]) -> Iterator[Tuple[int, bool]]:
+    """
+    Check multiple image URLs concurrently, yielding results as they complete.
+    Lets callers display fast results without waiting for the slowest URL.
+
+    Args:
+        urls: Sequence of image URLs to check (list or numpy object array)
+
+    Yields:
+        Tuples of (position in urls, status) in completion order
+    """
+    results = queue.Queue()
+    future = submit(
+        check_images_async(urls, on_result=lambda *result: results.put(result))
+    )
+    future.add_done_callback(lambda _: results.put(None))
+
+    while (result := results.get()) is not None:
+        yield result
+
+    # Surface unexpected failures of the batch itself
+    future.result()